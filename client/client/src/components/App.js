@@ -13,27 +13,6 @@ import Theaters from "./Theaters";
 
 function App() {
   const [user, setUser] = useState(null);
-  const [movies, setMovies] = useState([]);
-
-  useEffect(() => {
-    const fetchMovies = async () => {
-        try {
-            const url = '/movies';
-            const response = await fetch(url, {
-                headers: {
-                    'Accept': "application/json",
-                    'Content-Type': "application/json",
-                },
-            });
-            const data = await response.json();
-            setMovies(data);
-            console.log(data)
-        } catch (error) {
-            console.log('Error fetching movies:', error);
-        }
-    };
-    fetchMovies();
-}, []);
 
   useEffect(() => {
     // auto-login
@@ -73,10 +52,10 @@ function App() {
             <Admin />
           </Route>
           <Route path="/now-showing">
-             <NowShowing  movies={movies}/>
+             <NowShowing />
           </Route>
           <Route path="/coming-soon">
-              <ComingSoon movies={movies} />
+              <ComingSoon />
           </Route>
           <Route path="/theaters" >
             <Theaters />
@@ -2,13 +2,18 @@
 import React, { useEffect, useState } from "react";
 import { Link } from "react-router-dom";
 
-export default function ComingSoon({ movies }) {
+// Only what the movie cards show
+const MOVIE_CARD_FIELDS = "title,genre,director,release_date,poster_image";
+
+export default function ComingSoon() {
     const [comingSoonMovies, setComingSoonMovies] = useState([]);
 
     useEffect(() => {
-        const filteredMovies = movies.filter(movie => movie.tag === "upcoming");
-        setComingSoonMovies(filteredMovies);
-    }, [movies]);
+        fetch(`/movies?tag=upcoming&fields=${MOVIE_CARD_FIELDS}`)
+            .then(response => response.json())
+            .then(setComingSoonMovies)
+            .catch(error => console.log('Error fetching movies:', error));
+    }, []);
 
     return (
         <div>
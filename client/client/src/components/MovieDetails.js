@@ -4,8 +4,8 @@ import { useParams } from "react-router-dom";
 export default function MovieDetails({ user }) {
     const { movieId } = useParams();
     const [movie, setMovie] = useState(null);
-    const [tickets, setTickets] = useState([]);
     const [reviews, setReviews] = useState([]);
+    const [nextReviewsCursor, setNextReviewsCursor] = useState(null);
     const [theaters, setTheaters] = useState([]);
     const [selectedTheaterId, setSelectedTheaterId] = useState(null);
     const [selectedTheater, setSelectedTheater] = useState(null);
@@ -26,7 +26,7 @@ export default function MovieDetails({ user }) {
     const [showBuyTicketForm, setShowBuyTicketForm] = useState(false);
     const [selectedDate, setSelectedDate] = useState(null);
     const [selectedTime, setSelectedTime] = useState(null);
-    const [showtimes, setShowtimes] = useState(["11:00 AM", "01:00 PM", "03:00 PM", "05:00 PM"]);
+    const [showtimes, setShowtimes] = useState([]);
 
     const handleChange = (e) => {
         const { name, value } = e.target;
@@ -42,17 +42,6 @@ export default function MovieDetails({ user }) {
         }));
     };
 
-    const generateRandomShowtimes = () => {
-        const randomShowtimes = [];
-        for (let i = 0; i < 4; i++) {
-            const randomHour = Math.floor(Math.random() * 24);
-            const randomMinute = Math.floor(Math.random() * 60);
-            const showtime = new Date().setHours(randomHour, randomMinute);
-            randomShowtimes.push(new Date(showtime));
-        }
-        return randomShowtimes;
-    };
-
     const fetchMovie = async (movieId) => {
         const url = `/movies/${movieId}`;
         try {
@@ -105,36 +94,38 @@ export default function MovieDetails({ user }) {
         }
     };
 
-    const getMovieReviews = (movieId) => {
-        movieId = parseInt(movieId);
-        fetch("/reviews")
+    const getMovieReviews = (movieId, cursor = null) => {
+        const query = cursor === null ? "" : `&cursor=${cursor}`;
+        fetch(`/reviews?movie_id=${parseInt(movieId)}${query}`)
             .then((response) => response.json())
             .then((data) => {
-                const movieReviews = data.filter((review) => review.movie.id === movieId);
-                setReviews(movieReviews);
+                setReviews((previous) => (cursor === null ? data.results : [...previous, ...data.results]));
+                setNextReviewsCursor(data.next);
             })
             .catch((error) => {
                 console.error("Error fetching movie reviews:", error);
             });
     };
 
-    const averageMovieRating = () => {
-        if (reviews.length === 0) return 0;
-        const totalRating = reviews.reduce((acc, review) => acc + review.rating, 0);
-        const averageRating = totalRating / reviews.length;
-        return parseFloat(averageRating.toFixed(1)); // Round to one decimal point
+    const fetchTheaters = () => {
+        fetch("/theaters?fields=id,name,location")
+            .then((response) => response.json())
+            .then((data) => {
+                setTheaters(data);
+            })
+            .catch((error) => {
+                console.error("Error fetching theaters", error);
+            });
     };
 
-    const fetchTickets = (movieId) => {
-        movieId = parseInt(movieId);
-        fetch("/tickets")
+    const fetchShowings = (movieId, theaterId, date) => {
+        fetch(`/movies/${movieId}/showings?theatre_id=${theaterId}&date=${date}`)
             .then((response) => response.json())
             .then((data) => {
-                const movieTickets = data.filter((ticket) => parseInt(ticket.movie.id) === movieId);
-                setTickets(movieTickets);
+                setShowtimes(data);
             })
             .catch((error) => {
-                console.error("Error fetching tickets", error);
+                console.error("Error fetching showings", error);
             });
     };
 
@@ -154,14 +145,6 @@ export default function MovieDetails({ user }) {
         }
     };
 
-    const fetchTheatersForTickets = async () => {
-        const theaterIds = tickets.map((ticket) => parseInt(ticket.theatre.id));
-        const uniqueTheaterIds = Array.from(new Set(theaterIds));
-        const theatersPromises = uniqueTheaterIds.map((theaterId) => fetchTheaterById(theaterId));
-        const theatersData = await Promise.all(theatersPromises);
-        setTheaters(theatersData.filter((theater) => theater !== null));
-    };
-
     const handleTheaterChange = async (event) => {
         const theaterId = event.target.value;
         setSelectedTheaterId(theaterId);
@@ -178,36 +161,45 @@ export default function MovieDetails({ user }) {
     useEffect(() => {
         if (movieId) {
             fetchMovie(movieId);
-            fetchTickets(movieId);
+            fetchTheaters();
             getMovieReviews(movieId);
         }
     }, [movieId]);
 
     useEffect(() => {
-        fetchTheatersForTickets();
-    }, [tickets]);
-
-    useEffect(() => {
-        if (selectedTheater && selectedDate) {
-            // Logic to fetch showtimes based on selected theater and date
-            const randomShowtimes = generateRandomShowtimes();
-            setShowtimes(randomShowtimes);
+        if (selectedTheaterId && selectedDate) {
+            fetchShowings(movieId, selectedTheaterId, selectedDate);
+        } else {
+            setShowtimes([]);
         }
-    }, [selectedTheater, selectedDate]);
+        setSelectedTime(null);
+    }, [movieId, selectedTheaterId, selectedDate]);
 
     const handleTicketSubmit = async (e) => {
         e.preventDefault();
+        const showing = showtimes.find((showing) => showing.id === parseInt(selectedTime));
+        if (!showing) {
+            alert("Please select a showtime.");
+            return;
+        }
+        // One key per purchase: if the connection drops after the server has
+        // booked the seats, the retry replays that booking instead of a second one.
+        const request = {
+            method: "POST",
+            headers: {
+                "Content-Type": "application/json",
+                "Idempotency-Key": crypto.randomUUID()
+            },
+            body: JSON.stringify({
+                ...ticketFormData,
+                theatre_id: showing.theatre_id,
+                screen: showing.screen,
+                showtime: showing.start_time,
+                purchase_date: new Date().toISOString().split('T')[0]
+            })
+        };
         try {
-            const response = await fetch("/tickets", {
-                method: "POST",
-                headers: {
-                    "Content-Type": "application/json"
-                },
-                body: JSON.stringify({
-                    ...ticketFormData,
-                    showtime: `${ticketFormData.date} ${selectedTime}` // Combine date and time for showtime
-                })
-            });
+            const response = await fetch("/tickets", request).catch(() => fetch("/tickets", request));
             if (response.ok) {
                 alert("Ticket purchased successfully!");
                 // Reset ticket form data
@@ -217,6 +209,8 @@ export default function MovieDetails({ user }) {
                     price: 0,
                     screen: ""
                 });
+            } else if (response.status === 409) {
+                alert("Not enough seats left for this showing.");
             } else {
                 alert("Error purchasing ticket. Please try again later.");
             }
@@ -257,7 +251,7 @@ export default function MovieDetails({ user }) {
                                 <p><strong>Director:</strong> {movie.director}</p>
                                 <p><strong>Release Date:</strong> {movie.release_date}</p>
                                 <p><strong>About:</strong> {movie.about}</p>
-                                <p><strong>Average Rating: </strong>{averageMovieRating()}/5</p>
+                                <p><strong>Average Rating: </strong>{movie.rating_average}/5</p>
                             </div>
                             {/* Comments section */}
                             <div className="comments-section">
@@ -271,6 +265,11 @@ export default function MovieDetails({ user }) {
                                         </li>
                                     ))}
                                 </ul>
+                                {nextReviewsCursor !== null && (
+                                    <button className="btn btn-secondary" onClick={() => getMovieReviews(movieId, nextReviewsCursor)}>
+                                        Load more reviews
+                                    </button>
+                                )}
                                 {/* Comment form */}
                                 <form onSubmit={handleCommentSubmit}>
                                     <div className="form-group">
@@ -363,7 +362,10 @@ export default function MovieDetails({ user }) {
                                             className="form-control"
                                             name="date"
                                             value={ticketFormData.date}
-                                            onChange={(e) => setTicketFormData({ ...ticketFormData, date: e.target.value })}
+                                            onChange={(e) => {
+                                                setTicketFormData({ ...ticketFormData, date: e.target.value });
+                                                setSelectedDate(e.target.value);
+                                            }}
                                             min={today.toISOString().split('T')[0]} // Convert to ISO string and format to 'YYYY-MM-DD'
                                             max={twoWeeksFromNow.toISOString().split('T')[0]} // Convert to ISO string and format to 'YYYY-MM-DD'
                                             required
@@ -378,8 +380,10 @@ export default function MovieDetails({ user }) {
                                                     required
                                                 >
                                                     <option value="">Select a time</option>
-                                                    {showtimes.map((time, index) => (
-                                                        <option key={index} value={time}>{time}</option>
+                                                    {showtimes.map((showing) => (
+                                                        <option key={showing.id} value={showing.id} disabled={showing.seats_remaining === 0}>
+                                                            {showing.start_time.split(' ')[1]} (Screen {showing.screen}, {showing.seats_remaining} seats left)
+                                                        </option>
                                                     ))}
                                                 </select>
                                             </div>
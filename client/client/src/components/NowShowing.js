@@ -1,14 +1,19 @@
 import React, { useState, useEffect } from "react";
 import { Link } from "react-router-dom"; // Import Link if you're using react-router
 
-function NowShowing({ movies }) {
+// Only what the movie cards show
+const MOVIE_CARD_FIELDS = "title,genre,director,release_date,poster_image";
+
+function NowShowing() {
   const [nowShowingMovies, setNowShowingMovies] = useState([]);
 
   useEffect(() => {
-    // Filter movies based on the "in_theaters" tag
-    const filteredMovies = movies.filter(movie => movie.tag === "in theatres");
-    setNowShowingMovies(filteredMovies);
-  }, [movies]);
+    // Only movies tagged "in theatres", filtered by the server
+    fetch(`/movies?tag=${encodeURIComponent("in theatres")}&fields=${MOVIE_CARD_FIELDS}`)
+      .then(response => response.json())
+      .then(setNowShowingMovies)
+      .catch(error => console.log('Error fetching movies:', error));
+  }, []);
 
   return (
     <div>
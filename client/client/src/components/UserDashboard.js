@@ -2,7 +2,9 @@ import React, { useState, useEffect } from "react";
 
 export default function UserDashboard({ user }) {
   const [reviews, setReviews] = useState([]);
+  const [nextReviewsCursor, setNextReviewsCursor] = useState(null);
   const [tickets, setTickets] = useState([]);
+  const [nextTicketsCursor, setNextTicketsCursor] = useState(null);
   const [editingReviewId, setEditingReviewId] = useState(null);
   const [editedReview, setEditedReview] = useState({
     rating: "",
@@ -16,24 +18,26 @@ export default function UserDashboard({ user }) {
     }
   }, [user]);
 
-  const fetchUserReviews = (userId) => {
-    fetch("/reviews")
+  const fetchUserReviews = (userId, cursor = null) => {
+    const query = cursor === null ? "" : `&cursor=${cursor}`;
+    fetch(`/reviews?user_id=${userId}${query}`)
       .then((response) => response.json())
       .then((data) => {
-        const userReviews = data.filter((review) => review.user.id === userId);
-        setReviews(userReviews);
+        setReviews((previous) => (cursor === null ? data.results : [...previous, ...data.results]));
+        setNextReviewsCursor(data.next);
       })
       .catch((error) => {
         console.error("Error fetching user reviews:", error);
       });
   };
 
-  const fetchUserTickets = (userId) => {
-    fetch("/tickets")
+  const fetchUserTickets = (userId, cursor = null) => {
+    const query = cursor === null ? "" : `&cursor=${cursor}`;
+    fetch(`/users/${userId}/tickets?fields=quantity,price&include=movie${query}`)
       .then((response) => response.json())
       .then((data) => {
-        const userTickets = data.filter((ticket) => ticket.user.id === userId);
-        setTickets(userTickets);
+        setTickets((previous) => (cursor === null ? data.results : [...previous, ...data.results]));
+        setNextTicketsCursor(data.next);
       })
       .catch((error) => {
         console.error("Error fetching user tickets", error);
@@ -190,6 +194,11 @@ export default function UserDashboard({ user }) {
             </div>
           ))}
         </div>
+        {nextReviewsCursor !== null && (
+          <button className="btn btn-secondary" onClick={() => fetchUserReviews(user.id, nextReviewsCursor)}>
+            Load more reviews
+          </button>
+        )}
       </div>
       <div>
         <h3>User Tickets</h3>
@@ -206,6 +215,11 @@ export default function UserDashboard({ user }) {
             </div>
           ))}
         </div>
+        {nextTicketsCursor !== null && (
+          <button className="btn btn-secondary" onClick={() => fetchUserTickets(user.id, nextTicketsCursor)}>
+            Load more tickets
+          </button>
+        )}
       </div>
     </div>
   );
@@ -0,0 +1,79 @@
+import csv
+from itertools import islice
+
+import click
+from sqlalchemy.dialects.sqlite import insert
+
+from config import app, db
+from hashing import password_hasher
+from models.users import User
+
+IMPORT_BATCH_SIZE = 5000
+
+# Bulk account import. Rows are checked for shape only; uniqueness is left to
+# the unique indexes, with ON CONFLICT DO NOTHING so one duplicate does not
+# abort the batch. Records may carry a plaintext "password" (hashed on the
+# bcrypt pool) or an existing bcrypt "password_hash" from another system.
+
+def import_users(records):
+    results = []
+    rows = []
+    plaintext = []
+    for index, record in enumerate(records):
+        if not isinstance(record, dict):
+            results.append({"index": index, "status": 400, "error": "Validation error: Expected an object."})
+            continue
+        username = record.get('username')
+        email = record.get('email')
+        if not username or not email or not isinstance(username, str) or not isinstance(email, str):
+            results.append({"index": index, "status": 400, "error": "Validation error: username and email are required."})
+            continue
+        if not record.get('password') and not record.get('password_hash'):
+            results.append({"index": index, "status": 400, "error": "Validation error: password or password_hash is required."})
+            continue
+
+        row = {"username": username, "email": email, "_password_hash": record.get('password_hash')}
+        if not row["_password_hash"]:
+            plaintext.append((row, record['password']))
+        results.append({"index": index, "username": username})
+        rows.append(row)
+
+    for (row, _), password_hash in zip(plaintext, password_hasher.hash_many([password for _, password in plaintext])):
+        row["_password_hash"] = password_hash
+
+    inserted = {}
+    for start in range(0, len(rows), IMPORT_BATCH_SIZE):
+        batch = rows[start:start + IMPORT_BATCH_SIZE]
+        returned = db.session.execute(
+            insert(User.__table__)
+            .on_conflict_do_nothing()
+            .returning(User.__table__.c.id, User.__table__.c.username),
+            batch,
+        )
+        inserted.update({username: user_id for user_id, username in returned})
+        db.session.commit()
+
+    for result in results:
+        if 'username' not in result:
+            continue
+        if result['username'] in inserted:
+            result.update(status=201, id=inserted.pop(result['username']))
+        else:
+            result.update(status=409, error="Username or email already exists")
+    return results
+
+@app.cli.command('import-users')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+def import_users_command(path):
+    """Import accounts from a CSV with username, email and password or password_hash columns."""
+    created = total = 0
+    with open(path, newline='') as csv_file:
+        reader = csv.DictReader(csv_file)
+        while True:
+            chunk = list(islice(reader, IMPORT_BATCH_SIZE))
+            if not chunk:
+                break
+            results = import_users(chunk)
+            created += sum(1 for result in results if result['status'] == 201)
+            total += len(results)
+    click.echo(f"Imported {created} of {total} users.")
@@ -0,0 +1,89 @@
+from sqlalchemy import event, func, inspect, select
+
+from config import app, db
+from models.movies import Movie
+from models.reviews import Review
+from models.tickets import Ticket
+
+# Per-movie review and ticket totals live on the movies row so that /movies
+# never has to touch the reviews or tickets tables. The listeners below run
+# inside the flush, on the same connection, so the counters commit or roll
+# back together with the row that changed them.
+
+movies = Movie.__table__
+
+def adjust_movie_stats(connection, movie_id, review_count=0, rating_sum=0, tickets_sold=0):
+    if movie_id is None:
+        return
+    connection.execute(
+        movies.update()
+        .where(movies.c.id == movie_id)
+        .values(
+            review_count=movies.c.review_count + review_count,
+            rating_sum=movies.c.rating_sum + rating_sum,
+            tickets_sold=movies.c.tickets_sold + tickets_sold,
+        )
+    )
+
+def previous_value(target, key):
+    history = inspect(target).attrs[key].history
+    return history.deleted[0] if history.deleted else getattr(target, key)
+
+@event.listens_for(Review, 'after_insert')
+def review_inserted(mapper, connection, target):
+    adjust_movie_stats(connection, target.movie_id, review_count=1, rating_sum=target.rating)
+
+@event.listens_for(Review, 'after_update')
+def review_updated(mapper, connection, target):
+    old_movie_id = previous_value(target, 'movie_id')
+    old_rating = previous_value(target, 'rating')
+    if (old_movie_id, old_rating) == (target.movie_id, target.rating):
+        return
+    adjust_movie_stats(connection, old_movie_id, review_count=-1, rating_sum=-old_rating)
+    adjust_movie_stats(connection, target.movie_id, review_count=1, rating_sum=target.rating)
+
+@event.listens_for(Review, 'after_delete')
+def review_deleted(mapper, connection, target):
+    adjust_movie_stats(connection, previous_value(target, 'movie_id'), review_count=-1, rating_sum=-previous_value(target, 'rating'))
+
+@event.listens_for(Ticket, 'after_insert')
+def ticket_inserted(mapper, connection, target):
+    adjust_movie_stats(connection, target.movie_id, tickets_sold=target.quantity)
+
+@event.listens_for(Ticket, 'after_update')
+def ticket_updated(mapper, connection, target):
+    old_movie_id = previous_value(target, 'movie_id')
+    old_quantity = previous_value(target, 'quantity')
+    if (old_movie_id, old_quantity) == (target.movie_id, target.quantity):
+        return
+    adjust_movie_stats(connection, old_movie_id, tickets_sold=-old_quantity)
+    adjust_movie_stats(connection, target.movie_id, tickets_sold=target.quantity)
+
+@event.listens_for(Ticket, 'after_delete')
+def ticket_deleted(mapper, connection, target):
+    adjust_movie_stats(connection, previous_value(target, 'movie_id'), tickets_sold=-previous_value(target, 'quantity'))
+
+def tickets_bulk_inserted(connection, rows):
+    # Bulk INSERTs skip the mapper events, so callers report them here.
+    sold = {}
+    for row in rows:
+        sold[row['movie_id']] = sold.get(row['movie_id'], 0) + row['quantity']
+    for movie_id, quantity in sold.items():
+        adjust_movie_stats(connection, movie_id, tickets_sold=quantity)
+
+def rebuild_movie_stats():
+    reviews = Review.__table__
+    tickets = Ticket.__table__
+    db.session.execute(
+        movies.update().values(
+            review_count=select(func.count(reviews.c.id)).where(reviews.c.movie_id == movies.c.id).scalar_subquery(),
+            rating_sum=select(func.coalesce(func.sum(reviews.c.rating), 0)).where(reviews.c.movie_id == movies.c.id).scalar_subquery(),
+            tickets_sold=select(func.coalesce(func.sum(tickets.c.quantity), 0)).where(tickets.c.movie_id == movies.c.id).scalar_subquery(),
+        )
+    )
+    db.session.commit()
+
+@app.cli.command('rebuild-movie-stats')
+def rebuild_movie_stats_command():
+    """Recompute every movie's review and ticket totals from scratch."""
+    rebuild_movie_stats()
@@ -1,10 +1,13 @@
 #!/usr/bin/env python3
 
 # Standard library imports
+from datetime import date, datetime, time, timedelta
 
 # Remote library imports
 from flask import request,session,jsonify,make_response
 from flask_restful import Resource
+from sqlalchemy import insert, inspect
+from sqlalchemy.exc import IntegrityError
 
 # Local imports
 from config import app, db, api
@@ -15,6 +18,73 @@ from models.tickets import Ticket
 from models.users import User
 from models.reviews import Review
 from models.theaters import Theatre
+from models.showings import Showing
+from models.seat_holds import SeatHold
+import aggregates  # registers the movie stats listeners
+from aggregates import tickets_bulk_inserted
+from accounts import IMPORT_BATCH_SIZE, import_users
+from cache import response_cache
+from fieldsets import FieldsetError, movie_fields, review_fields, theatre_fields, ticket_fields
+from hashing import HashingBusy, password_hasher
+from holds import hold_sweeper, release_held, take_hold
+from idempotency import idempotent, record_response
+from inventory import CapacityError, open_showing, reserve_seats, release_seats, resize_theatre
+from metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, request_metrics
+from querywatch import query_watch
+from rollups import daily_sales, sales_bulk_inserted, sales_by_movie, sales_by_theatre, sales_summary
+from queries import reviews_query, showings_query, tickets_query
+from search import RANK_WINDOW, in_rank_order, match_expression, ranked_ids
+from serializers import parse_date, parse_showtime, serialize_hold, serialize_review, serialize_ticket
+from streaming import stream_collection, wants_stream
+from user_summaries import user_summaries
+import tagging  # retags newly released movies once a day
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+MAX_BATCH_SIZE = 500
+
+TICKET_FIELDS = ('user_id', 'movie_id', 'theatre_id', 'price', 'purchase_date', 'screen', 'quantity', 'showtime')
+HOLD_FIELDS = ('user_id', 'movie_id', 'theatre_id', 'price', 'screen', 'quantity', 'showtime')
+
+def int_arg(key, default=None):
+    # Raises ValueError for a value that isn't an integer, where
+    # request.args.get(type=int) would quietly fall back to the default.
+    value = request.args.get(key)
+    return int(value) if value else default
+
+def page_limit():
+    return max(1, min(int_arg('limit', DEFAULT_PAGE_SIZE), MAX_PAGE_SIZE))
+
+def paginate(query, model):
+    # Keyset pagination: the cursor is the last id of the previous page, so
+    # every page is an index seek instead of an OFFSET scan. Raises
+    # ValueError for a limit or cursor that isn't an integer.
+    limit = page_limit()
+    cursor = int_arg('cursor')
+    if cursor is not None:
+        query = query.filter(model.id > cursor)
+
+    rows = query.order_by(model.id).limit(limit + 1).all()
+    next_cursor = rows[limit - 1].id if len(rows) > limit else None
+    return rows[:limit], next_cursor
+
+def filter_by_args(query, model, *keys):
+    # Raises ValueError for a value that isn't an integer, rather than
+    # dropping the filter and returning every row.
+    for key in keys:
+        if request.args.get(key):
+            query = query.filter(getattr(model, key) == int(request.args[key]))
+    return query
+
+def filter_by_range(query, column, from_key, to_key, parse):
+    # Inclusive bounds, parsed to the column's type so they compare as an
+    # index range scan. Raises ValueError for a malformed bound.
+    if request.args.get(from_key):
+        query = query.filter(column >= parse(request.args[from_key]))
+    if request.args.get(to_key):
+        query = query.filter(column <= parse(request.args[to_key]))
+    return query
+
 # Views go here!
 
 @app.route('/')
@@ -31,8 +101,16 @@ class ClearSession(Resource):
         return {}, 204
     
 class Movies(Resource):
+    @response_cache.cached('movies')
     def get(self):
-        movies = [movie.to_dict() for movie in Movie.query.all()]
+        try:
+            selection = movie_fields.select()
+        except FieldsetError as e:
+            return make_response(jsonify({"error": str(e)}), 400)
+        query = selection.apply(Movie.query)
+        if request.args.get('tag'):
+            query = query.filter(Movie.tag == request.args['tag'])
+        movies = [selection.serialize(movie) for movie in query.all()]
         return make_response(jsonify(movies),200)
     
     def post(self):
@@ -54,6 +132,7 @@ class Movies(Resource):
         try:
             db.session.add(movie)
             db.session.commit()
+            response_cache.invalidate('movies')
             return make_response(jsonify(movie.to_dict()), 201)
         
         except Exception as e:
@@ -62,6 +141,7 @@ class Movies(Resource):
         
     
 class Movie_By_ID(Resource):
+    @response_cache.cached('movies')
     def get(self, id):
         movie = Movie.query.filter_by(id=id).first()
         
@@ -89,10 +169,12 @@ class Movie_By_ID(Resource):
                 movie.director = data['director']
             if 'release_date' in data:
                 movie.release_date = data['release_date']
+                movie.tag = movie.calculate_tag
             if 'poster_image' in data:
                 movie.poster_image = data['poster_image']
 
             db.session.commit()
+            response_cache.invalidate('movies')
             return make_response(jsonify({"message": "Movie updated successfully.", "movie": movie.to_dict()}), 200)
 
         except Exception as e:
@@ -109,6 +191,7 @@ class Movie_By_ID(Resource):
         try:
             db.session.delete(movie)
             db.session.commit()
+            response_cache.invalidate('movies')
             return make_response(jsonify({"message": "Movie deleted successfully."}), 200)
 
         except Exception as e:
@@ -117,8 +200,13 @@ class Movie_By_ID(Resource):
 
     
 class Theaters(Resource):
+    @response_cache.cached('theaters')
     def get(self):
-        theatres = [theatre.to_dict() for theatre in Theatre.query.all()]
+        try:
+            selection = theatre_fields.select()
+        except FieldsetError as e:
+            return make_response(jsonify({"error": str(e)}), 400)
+        theatres = [selection.serialize(theatre) for theatre in selection.apply(Theatre.query).all()]
         return make_response(jsonify(theatres), 200)
 
     def post(self):
@@ -136,6 +224,7 @@ class Theaters(Resource):
             theatre = Theatre(name=name, location=location, capacity=capacity)
             db.session.add(theatre)
             db.session.commit()
+            response_cache.invalidate('theaters')
             return make_response(jsonify({"message": "Theater created successfully.", "theatre": theatre.to_dict()}), 201)
         
         except Exception as e:
@@ -144,27 +233,22 @@ class Theaters(Resource):
 
 class Reviews(Resource):
     def get(self):
-        reviews = Review.query.all()
-        reviews_data = []
-        for review in reviews:
-            response_data = {
-             "id": review.id,
-            "comment": review.comment,
-            "rating":review.rating,
-            "user": {
-                "id":review.user.id,
-                "name":review.user.username,
-            },
-            "movie": {
-                "id":review.movie.id,
-                "title":review.movie.title,
-                "genre": review.movie.genre,
-                "director": review.movie.director,
-                "release_date": review.movie.release_date   
-            }
-            }
-            reviews_data.append(response_data)
-        return make_response(jsonify(reviews_data), 200)
+        try:
+            selection = review_fields.select()
+        except FieldsetError as e:
+            return make_response(jsonify({"error": str(e)}), 400)
+        try:
+            query = filter_by_args(selection.apply(Review.query), Review, 'movie_id', 'user_id')
+        except ValueError:
+            return make_response(jsonify({"error": "Validation error: movie_id and user_id must be integers."}), 400)
+        if wants_stream():
+            return stream_collection(query.order_by(Review.id), selection.serialize)
+        try:
+            reviews, next_cursor = paginate(query, Review)
+        except ValueError:
+            return make_response(jsonify({"error": "Validation error: limit and cursor must be integers."}), 400)
+        reviews_data = [selection.serialize(review) for review in reviews]
+        return make_response(jsonify({"results": reviews_data, "next": next_cursor}), 200)
 
     def post(self):
         data = request.get_json()
@@ -186,23 +270,9 @@ class Reviews(Resource):
             review = Review(rating=rating, comment=comment, user_id=user_id, movie_id=movie_id)
             db.session.add(review)
             db.session.commit()
+            response_cache.invalidate('movies')
             
-            response_data = {
-                "id": review.id,
-                "comment": review.comment,
-                "rating": review.rating,
-                "user": {
-                    "id": review.user.id,
-                    "name": review.user.username,
-                },
-                "movie": {
-                    "id": review.movie.id,
-                    "title": review.movie.title,
-                    "genre": review.movie.genre,
-                    "director": review.movie.director,
-                    "release_date": review.movie.release_date
-                }
-            }
+            response_data = serialize_review(review)
 
             return make_response(jsonify({"message": "Review added successfully.", "review": response_data}), 201)
 
@@ -215,29 +285,13 @@ class Reviews(Resource):
 
 class ReviewById(Resource):
     def get(self, id):
-        review = Review.query.filter_by(id=id).first()
-        response_data = {
-            "id": review.id,
-            "comment": review.comment,
-            "rating":review.rating,
-            "user": {
-                "id":review.user.id,
-                "name":review.user.username,
-            },
-            "movie": {
-                "id":review.movie.id,
-                "title":review.movie.title,
-                "genre": review.movie.genre,
-                "director": review.movie.director,
-                "release_date": review.movie.release_date
-            }
-        }
+        review = reviews_query().filter_by(id=id).first()
         
         if not review:
             response_dict = {"error": "Review not found"}
             return make_response(jsonify(response_dict), 404)
         
-        return make_response(jsonify(response_data), 200)
+        return make_response(jsonify(serialize_review(review)), 200)
 
     def patch(self, id):
         review = Review.query.filter_by(id=id).first()
@@ -255,6 +309,7 @@ class ReviewById(Resource):
                 review.comment = data['comment']
 
             db.session.commit()
+            response_cache.invalidate('movies')
             return make_response(jsonify({"message": "Review updated successfully.", "review": review.to_dict()}), 200)
 
         except Exception as e:
@@ -271,6 +326,7 @@ class ReviewById(Resource):
         try:
             db.session.delete(review)
             db.session.commit()
+            response_cache.invalidate('movies')
             return make_response(jsonify({"message": "Review deleted successfully."}), 200)
 
         except Exception as e:
@@ -279,37 +335,32 @@ class ReviewById(Resource):
 
 class Tickets(Resource):
     def get(self):
-        tickets = Ticket.query.all()
-        tickets_data = []
-        for ticket in tickets:
-            response_data = {
-            "id": ticket.id,
-            "price": ticket.price,
-            "purchase_date": ticket.purchase_date,
-            "screen":ticket.screen,
-            "quantity":ticket.quantity,
-            "showtime":ticket.showtime,
-            "user": {
-                "id":ticket.user.id,
-                "name":ticket.user.username,
-            },
-            "movie": {
-                "id":ticket.movie.id,
-                "title":ticket.movie.title,
-                "genre": ticket.movie.genre,
-                "director": ticket.movie.director,
-                "release_date": ticket.movie.release_date
-            },
-            "theatre": {
-                "id": ticket.theatre.id,
-                "name": ticket.theatre.name,
-                "location": ticket.theatre.location,
-                "capacity":ticket.theatre.capacity,
-            }
-            }
-            tickets_data.append(response_data)
-        return make_response(jsonify(tickets_data), 200)
+        try:
+            selection = ticket_fields.select()
+        except FieldsetError as e:
+            return make_response(jsonify({"error": str(e)}), 400)
+        try:
+            query = filter_by_args(selection.apply(Ticket.query), Ticket, 'movie_id', 'user_id', 'theatre_id')
+        except ValueError:
+            return make_response(jsonify({"error": "Validation error: movie_id, user_id and theatre_id must be integers."}), 400)
+        try:
+            query = filter_by_range(query, Ticket.showtime, 'showtime_from', 'showtime_to', parse_showtime)
+        except ValueError:
+            return make_response(jsonify({"error": "Validation error: showtime_from and showtime_to must be in the format YYYY-MM-DD HH:MM."}), 400)
+        try:
+            query = filter_by_range(query, Ticket.purchase_date, 'purchased_from', 'purchased_to', parse_date)
+        except ValueError:
+            return make_response(jsonify({"error": "Validation error: purchased_from and purchased_to must be in the format YYYY-MM-DD."}), 400)
+        if wants_stream():
+            return stream_collection(query.order_by(Ticket.id), selection.serialize)
+        try:
+            tickets, next_cursor = paginate(query, Ticket)
+        except ValueError:
+            return make_response(jsonify({"error": "Validation error: limit and cursor must be integers."}), 400)
+        tickets_data = [selection.serialize(ticket) for ticket in tickets]
+        return make_response(jsonify({"results": tickets_data, "next": next_cursor}), 200)
 
+    @idempotent
     def post(self):
         data = request.get_json()
         
@@ -328,48 +379,97 @@ class Tickets(Resource):
         
         try:
             ticket = Ticket(user_id=user_id, movie_id=movie_id, theatre_id=theatre_id, price=price, purchase_date=purchase_date, screen=screen,quantity=quantity,showtime=showtime)
+            if not reserve_seats(theatre_id, screen, ticket.showtime, quantity):
+                db.session.rollback()
+                return make_response(jsonify({"error": "Not enough seats available for this showing."}), 409)
             db.session.add(ticket)
+            db.session.flush()
+            body = {"message": "Ticket created successfully.", "ticket": ticket.to_dict()}
+            record_response(body, 201)
             db.session.commit()
-            return make_response(jsonify({"message": "Ticket created successfully.", "ticket": ticket.to_dict()}), 201)
+            response_cache.invalidate('movies', 'theaters')
+            return make_response(jsonify(body), 201)
         
         except Exception as e:
             db.session.rollback()
             return make_response(jsonify({"error": "Failed to create ticket.", "details": str(e)}), 400)
 
+class TicketsBatch(Resource):
+    @query_watch.allow_repeats
+    @idempotent
+    def post(self):
+        data = request.get_json()
+        purchases = data.get('tickets') if isinstance(data, dict) else data
+
+        if not isinstance(purchases, list) or not purchases:
+            return make_response(jsonify({"error": "Validation error: Expected a non-empty list of tickets."}), 400)
+        if len(purchases) > MAX_BATCH_SIZE:
+            return make_response(jsonify({"error": f"Validation error: At most {MAX_BATCH_SIZE} tickets per batch."}), 400)
+
+        # Every purchase is validated and its seats reserved up front; the
+        # accepted ones then go in as one multi-row INSERT and the whole batch
+        # commits once, instead of one write transaction per ticket.
+        results = []
+        accepted = []
+        try:
+            for index, purchase in enumerate(purchases):
+                if not isinstance(purchase, dict) or any(field not in purchase for field in TICKET_FIELDS):
+                    results.append({"index": index, "status": 400, "error": "Validation error: Missing required fields."})
+                    continue
+
+                fields = {field: purchase[field] for field in TICKET_FIELDS}
+                try:
+                    ticket = Ticket(**fields)
+                    row = {**fields, "purchase_date": ticket.purchase_date, "showtime": ticket.showtime}
+                    reserved = reserve_seats(row['theatre_id'], row['screen'], row['showtime'], row['quantity'])
+                except ValueError as e:
+                    results.append({"index": index, "status": 400, "error": str(e)})
+                    continue
+                except TypeError:
+                    results.append({"index": index, "status": 400, "error": "Validation error: Invalid ticket fields."})
+                    continue
+
+                if not reserved:
+                    results.append({"index": index, "status": 409, "error": "Not enough seats available for this showing."})
+                    continue
+
+                results.append({"index": index, "status": 201})
+                accepted.append((results[-1], fields, row))
+
+            if not accepted:
+                # Nothing was bought, so the Idempotency-Key claim rolls back
+                # too and a retry runs again instead of replaying the 400.
+                db.session.rollback()
+                return make_response(jsonify({"created": 0, "results": results}), 400)
+
+            rows = [row for _, _, row in accepted]
+            ticket_ids = db.session.scalars(insert(Ticket).returning(Ticket.id, sort_by_parameter_order=True), rows).all()
+            tickets_bulk_inserted(db.session.connection(), rows)
+            sales_bulk_inserted(db.session.connection(), rows)
+            for (result, fields, _), ticket_id in zip(accepted, ticket_ids):
+                result["ticket"] = {"id": ticket_id, **fields}
+
+            body = {"created": len(accepted), "results": results}
+            record_response(body, 201)
+            db.session.commit()
+            response_cache.invalidate('movies', 'theaters')
+            user_summaries.invalidate(*{row['user_id'] for _, _, row in accepted})
+
+        except Exception as e:
+            db.session.rollback()
+            return make_response(jsonify({"error": "Failed to create tickets.", "details": str(e)}), 400)
+
+        return make_response(jsonify(body), 201)
+
 class TicketsByID(Resource):
     def get(self, id):
-        ticket = Ticket.query.filter_by(id=id).first()
-        response_data = {
-            "id": ticket.id,
-            "price": ticket.price,
-            "purchase_date": ticket.purchase_date,
-            "screen":ticket.screen,
-            "quantity":ticket.quantity,
-            "showtime":ticket.showtime,
-            "user": {
-                "id":ticket.user.id,
-                "name":ticket.user.username,
-            },
-            "movie": {
-                "id":ticket.movie.id,
-                "title":ticket.movie.title,
-                "genre": ticket.movie.genre,
-                "director": ticket.movie.director,
-                "release_date": ticket.movie.release_date
-            },
-            "theatre": {
-                "id": ticket.theatre.id,
-                "name": ticket.theatre.name,
-                "location": ticket.theatre.location,
-                "capacity":ticket.theatre.capacity,
-            }
-            }
+        ticket = tickets_query().filter_by(id=id).first()
         
         if not ticket:
             response_dict = {"error": "Ticket not found"}
             return make_response(jsonify(response_dict), 404)
         
-        return make_response(jsonify(response_data), 200)
+        return make_response(jsonify(serialize_ticket(ticket)), 200)
 
     def patch(self, id):
         ticket = Ticket.query.filter_by(id=id).first()
@@ -379,6 +479,7 @@ class TicketsByID(Resource):
             return make_response(jsonify(response_dict), 404)
 
         data = request.get_json()
+        previous_showing = (ticket.theatre_id, ticket.screen, ticket.showtime, ticket.quantity)
         
         try:
             if 'user_id' in data:
@@ -398,7 +499,15 @@ class TicketsByID(Resource):
             if 'showtime' in data:
                 ticket.showtime = data['showtime']
 
+            current_showing = (ticket.theatre_id, ticket.screen, ticket.showtime, ticket.quantity)
+            if current_showing != previous_showing:
+                release_seats(*previous_showing)
+                if not reserve_seats(*current_showing):
+                    db.session.rollback()
+                    return make_response(jsonify({"error": "Not enough seats available for this showing."}), 409)
+
             db.session.commit()
+            response_cache.invalidate('movies', 'theaters')
             return make_response(jsonify({"message": "Ticket updated successfully.", "ticket": ticket.to_dict()}), 200)
 
         except Exception as e:
@@ -413,15 +522,90 @@ class TicketsByID(Resource):
             return make_response(jsonify(response_dict), 404)
 
         try:
+            release_seats(ticket.theatre_id, ticket.screen, ticket.showtime, ticket.quantity)
             db.session.delete(ticket)
             db.session.commit()
+            response_cache.invalidate('movies', 'theaters')
             return make_response(jsonify({"message": "Ticket deleted successfully."}), 200)
 
         except Exception as e:
             db.session.rollback()
             return make_response(jsonify({"error": "Failed to delete ticket.", "details": str(e)}), 400)
 
+class Holds(Resource):
+    @idempotent
+    def post(self):
+        data = request.get_json()
+        if not isinstance(data, dict) or any(field not in data for field in HOLD_FIELDS):
+            return make_response(jsonify({"error": "Validation error: Missing required fields."}), 400)
+
+        try:
+            expires_at = datetime.now() + timedelta(seconds=app.config['SEAT_HOLD_TTL'])
+            hold = SeatHold(**{field: data[field] for field in HOLD_FIELDS}, expires_at=expires_at)
+            if not reserve_seats(hold.theatre_id, hold.screen, hold.showtime, hold.quantity):
+                db.session.rollback()
+                return make_response(jsonify({"error": "Not enough seats available for this showing."}), 409)
+            db.session.add(hold)
+            db.session.flush()
+            body = {"message": "Seats held.", "hold": serialize_hold(hold)}
+            record_response(body, 201)
+            db.session.commit()
+            hold_sweeper.schedule(expires_at)
+            return make_response(jsonify(body), 201)
+
+        except Exception as e:
+            db.session.rollback()
+            return make_response(jsonify({"error": "Failed to hold seats.", "details": str(e)}), 400)
+
+class HoldById(Resource):
+    def get(self, id):
+        hold = db.session.get(SeatHold, id)
+
+        if not hold or hold.expires_at <= datetime.now():
+            return make_response(jsonify({"error": "Hold not found or expired"}), 404)
+
+        return make_response(jsonify(serialize_hold(hold)), 200)
+
+    def delete(self, id):
+        # Expired holds are left for the sweeper, which releases their seats.
+        try:
+            hold = take_hold(id, now=datetime.now())
+            if not hold:
+                db.session.rollback()
+                return make_response(jsonify({"error": "Hold not found or expired"}), 404)
+            release_held([hold])
+            db.session.commit()
+            return make_response(jsonify({"message": "Hold released."}), 200)
+
+        except Exception as e:
+            db.session.rollback()
+            return make_response(jsonify({"error": "Failed to release hold.", "details": str(e)}), 400)
+
+class HoldConfirm(Resource):
+    @idempotent
+    def post(self, id):
+        # The hold's seats are already off the inventory, so confirming only
+        # swaps the hold row for a ticket.
+        try:
+            hold = take_hold(id, now=datetime.now())
+            if not hold:
+                db.session.rollback()
+                return make_response(jsonify({"error": "Hold not found or expired"}), 404)
+            ticket = Ticket(user_id=hold.user_id, movie_id=hold.movie_id, theatre_id=hold.theatre_id, price=hold.price, purchase_date=date.today(), screen=hold.screen, quantity=hold.quantity, showtime=hold.showtime)
+            db.session.add(ticket)
+            db.session.flush()
+            body = {"message": "Ticket created successfully.", "ticket": ticket.to_dict()}
+            record_response(body, 201)
+            db.session.commit()
+            response_cache.invalidate('movies', 'theaters')
+            return make_response(jsonify(body), 201)
+
+        except Exception as e:
+            db.session.rollback()
+            return make_response(jsonify({"error": "Failed to confirm hold.", "details": str(e)}), 400)
+
 class TheatreById(Resource):
+    @response_cache.cached('theaters')
     def get(self, id):
         theatre = Theatre.query.filter_by(id=id).first()
         
@@ -446,11 +630,18 @@ class TheatreById(Resource):
             if 'location' in data:
                 theatre.location = data['location']
             if 'capacity' in data:
+                previous_capacity = theatre.capacity
                 theatre.capacity = data['capacity']
+                resize_theatre(theatre.id, previous_capacity, theatre.capacity)
 
             db.session.commit()
+            response_cache.invalidate('theaters')
             return make_response(jsonify({"message": "Theater updated successfully.", "theatre": theatre.to_dict()}), 200)
 
+        except CapacityError as e:
+            db.session.rollback()
+            return make_response(jsonify({"error": str(e)}), 409)
+
         except Exception as e:
             db.session.rollback()
             return make_response(jsonify({"error": "Failed to update theatre.", "details": str(e)}), 400)
@@ -465,21 +656,160 @@ class TheatreById(Resource):
         try:
             db.session.delete(theatre)
             db.session.commit()
+            response_cache.invalidate('theaters')
             return make_response(jsonify({"message": "Theater deleted successfully."}), 200)
 
         except Exception as e:
             db.session.rollback()
             return make_response(jsonify({"error": "Failed to delete theatre.", "details": str(e)}), 400)
         
+class Showings(Resource):
+    def post(self):
+        data = request.get_json()
+
+        try:
+            movie_id = data['movie_id']
+            theatre_id = data['theatre_id']
+            screen = data['screen']
+            start_time = data['start_time']
+
+        except KeyError:
+            return make_response(jsonify({"error": "Validation error: Missing required fields."}), 400)
+
+        theatre = Theatre.query.filter_by(id=theatre_id).first()
+        if not theatre:
+            return make_response(jsonify({"error": "Theater not found"}), 404)
+
+        try:
+            showing = Showing(movie_id=movie_id, theatre_id=theatre_id, screen=screen, start_time=start_time, seats=data.get('seats', theatre.capacity))
+            db.session.add(showing)
+            open_showing(theatre_id, screen, showing.start_time, showing.seats)
+            db.session.commit()
+            return make_response(jsonify({"message": "Showing created successfully.", "showing": showing.to_dict()}), 201)
+
+        except Exception as e:
+            db.session.rollback()
+            return make_response(jsonify({"error": "Failed to create showing.", "details": str(e)}), 400)
+
+class MovieShowings(Resource):
+    def get(self, id):
+        query = showings_query().filter(Showing.movie_id == id)
+
+        day = request.args.get('date')
+        if day:
+            try:
+                start = datetime.combine(parse_date(day), time())
+            except ValueError:
+                return make_response(jsonify({"error": "Date must be in the format YYYY-MM-DD"}), 400)
+            query = query.filter(Showing.start_time >= start, Showing.start_time < start + timedelta(days=1))
+        else:
+            query = query.filter(Showing.start_time >= datetime.combine(date.today(), time()))
+
+        try:
+            theatre_id = int_arg('theatre_id')
+        except ValueError:
+            return make_response(jsonify({"error": "Validation error: theatre_id must be an integer."}), 400)
+        if theatre_id is not None:
+            query = query.filter(Showing.theatre_id == theatre_id)
+
+        showings = []
+        for showing, seats_remaining in query.order_by(Showing.start_time).all():
+            showing_data = showing.to_dict()
+            showing_data['seats_remaining'] = seats_remaining
+            showings.append(showing_data)
+        return make_response(jsonify(showings), 200)
+
+class Search(Resource):
+    def get(self):
+        match = match_expression(request.args.get('q', ''))
+        if match is None:
+            return make_response(jsonify({"error": "Validation error: q must contain at least one word."}), 400)
+        kind = request.args.get('type')
+        if kind not in (None, 'movies', 'reviews'):
+            return make_response(jsonify({"error": "Validation error: type must be movies or reviews."}), 400)
+
+        # Results are ordered by bm25 rank, so the cursor is an offset into
+        # the ranking rather than an id.
+        try:
+            limit = page_limit()
+            offset = max(0, int_arg('cursor', 0))
+        except ValueError:
+            return make_response(jsonify({"error": "Validation error: limit and cursor must be integers."}), 400)
+        if offset >= RANK_WINDOW:
+            return make_response(jsonify({"error": f"Validation error: search results stop after the top {RANK_WINDOW} matches."}), 400)
+
+        results = {}
+        if kind in (None, 'movies'):
+            ids, next_offset = ranked_ids('movies_fts', match, limit, offset)
+            movies = in_rank_order(ids, Movie.query.filter(Movie.id.in_(ids)).all()) if ids else []
+            results["movies"] = {"results": [movie.to_dict() for movie in movies], "next": next_offset}
+        if kind in (None, 'reviews'):
+            ids, next_offset = ranked_ids('reviews_fts', match, limit, offset)
+            reviews = in_rank_order(ids, reviews_query().filter(Review.id.in_(ids)).all()) if ids else []
+            results["reviews"] = {"results": [serialize_review(review) for review in reviews], "next": next_offset}
+        return make_response(jsonify(results), 200)
+
+class Analytics(Resource):
+    REPORTS = ('summary', 'daily', 'movies', 'theatres')
+
+    def get(self, report):
+        if report not in self.REPORTS:
+            return make_response(jsonify({"error": f"Unknown report. Expected one of: {', '.join(self.REPORTS)}."}), 404)
+        try:
+            start = parse_date(request.args['from']) if request.args.get('from') else None
+            end = parse_date(request.args['to']) if request.args.get('to') else None
+        except ValueError:
+            return make_response(jsonify({"error": "Validation error: from and to must be in the format YYYY-MM-DD."}), 400)
+
+        try:
+            filters = {"start": start, "end": end, "movie_id": int_arg('movie_id'), "theatre_id": int_arg('theatre_id')}
+            limit = page_limit()
+        except ValueError:
+            return make_response(jsonify({"error": "Validation error: movie_id, theatre_id and limit must be integers."}), 400)
+        if report == 'summary':
+            return make_response(jsonify(sales_summary(**filters)), 200)
+        if report == 'daily':
+            return make_response(jsonify({"results": daily_sales(**filters)}), 200)
+        if report == 'movies':
+            return make_response(jsonify({"results": sales_by_movie(limit, **filters)}), 200)
+        return make_response(jsonify({"results": sales_by_theatre(limit, **filters)}), 200)
+
+class CacheStats(Resource):
+    def get(self):
+        return make_response(jsonify({**response_cache.stats(), "user_summaries": user_summaries.stats()}), 200)
+
+class AuthStats(Resource):
+    def get(self):
+        return make_response(jsonify(password_hasher.stats()), 200)
+
+class Metrics(Resource):
+    def get(self):
+        return make_response(request_metrics.render(), 200, {'Content-Type': METRICS_CONTENT_TYPE})
+
 class Login(Resource):
     def post(self):
         data = request.get_json()
         username = data.get('username')  
+        password = data.get('password')
+        if not password:
+            return {}, 401
         user = User.query.filter(User.username == username).first()
+        # Write transactions open with BEGIN IMMEDIATE, so the lookup's has to
+        # end before bcrypt runs or bookings would wait out the whole hash on
+        # the write lock. The user stays loaded, detached from the session.
+        db.session.close()
         
-        if user and user.authenticate(data['password']):
+        try:
+            authenticated = user is not None and user.authenticate(password)
+        except HashingBusy as e:
+            return {"error": str(e)}, 503, {"Retry-After": "1"}
+
+        if authenticated:
+            if inspect(user).modified:
+                db.session.add(user)
+                db.session.commit()
             session['user_id'] = user.id
-            return user.to_dict(), 200
+            return user_summaries.get(user.id), 200
         
         return {}, 401
 
@@ -491,10 +821,38 @@ class Signup(Resource):
             username=json['username'],
             email=json['email']
         )
-        user.password_hash = json['password']
+        try:
+            user.password_hash = json['password']
+        except HashingBusy as e:
+            return {"error": str(e)}, 503, {"Retry-After": "1"}
         db.session.add(user)
-        db.session.commit()
-        return user.to_dict(), 201
+        try:
+            db.session.commit()
+        except IntegrityError as e:
+            db.session.rollback()
+            return {"errors": [User.uniqueness_error(e)]}, 400
+        return user_summaries.get(user.id), 201
+
+class UsersBulk(Resource):
+    def post(self):
+        data = request.get_json()
+        records = data.get('users') if isinstance(data, dict) else data
+
+        if not isinstance(records, list) or not records:
+            return make_response(jsonify({"error": "Validation error: Expected a non-empty list of users."}), 400)
+        if len(records) > IMPORT_BATCH_SIZE:
+            return make_response(jsonify({"error": f"Validation error: At most {IMPORT_BATCH_SIZE} users per request."}), 400)
+
+        try:
+            results = import_users(records)
+        except HashingBusy as e:
+            return make_response(jsonify({"error": str(e)}), 503)
+        except Exception as e:
+            db.session.rollback()
+            return make_response(jsonify({"error": "Failed to import users.", "details": str(e)}), 400)
+
+        created = sum(1 for result in results if result['status'] == 201)
+        return make_response(jsonify({"created": created, "results": results}), 201 if created else 400)
  
 class Logout(Resource):
     def delete(self):
@@ -503,13 +861,29 @@ class Logout(Resource):
     
 class CheckSession(Resource):
     def get(self):
-        user_id = session['user_id']
+        user_id = session.get('user_id')
         if user_id is not None:
-            user = User.query.filter(User.id == user_id).first()
-            if user is not None:
-                return user.to_dict()
+            summary = user_summaries.get(user_id)
+            if summary is not None:
+                return summary
         
         return {},204
+
+class UserTickets(Resource):
+    def get(self, id):
+        try:
+            selection = ticket_fields.select()
+        except FieldsetError as e:
+            return make_response(jsonify({"error": str(e)}), 400)
+        if db.session.get(User, id) is None:
+            return make_response(jsonify({"error": "User not found"}), 404)
+
+        try:
+            tickets, next_cursor = paginate(selection.apply(Ticket.query).filter(Ticket.user_id == id), Ticket)
+        except ValueError:
+            return make_response(jsonify({"error": "Validation error: limit and cursor must be integers."}), 400)
+        tickets_data = [selection.serialize(ticket) for ticket in tickets]
+        return make_response(jsonify({"results": tickets_data, "next": next_cursor}), 200)
     
 api.add_resource(ClearSession, '/clear', endpoint='clear')
 api.add_resource(Movies, '/movies')
@@ -519,9 +893,22 @@ api.add_resource(Reviews,'/reviews')
 api.add_resource(TheatreById, '/theaters/<int:id>')
 api.add_resource(ReviewById, '/reviews/<int:id>')
 api.add_resource(Tickets,'/tickets')
+api.add_resource(TicketsBatch, '/tickets/batch')
 api.add_resource(TicketsByID, '/tickets/<int:id>')
+api.add_resource(Holds, '/holds')
+api.add_resource(HoldById, '/holds/<int:id>')
+api.add_resource(HoldConfirm, '/holds/<int:id>/confirm')
+api.add_resource(Showings, '/showings')
+api.add_resource(MovieShowings, '/movies/<int:id>/showings')
+api.add_resource(Search, '/search', endpoint='search')
+api.add_resource(Analytics, '/analytics/<string:report>')
+api.add_resource(CacheStats, '/cache/stats', endpoint='cache_stats')
+api.add_resource(AuthStats, '/auth/stats', endpoint='auth_stats')
+api.add_resource(Metrics, '/metrics', endpoint='metrics')
 api.add_resource(Login, '/login', endpoint='login')
 api.add_resource(Signup, '/signup', endpoint='signup')
+api.add_resource(UsersBulk, '/users/bulk')
+api.add_resource(UserTickets, '/users/<int:id>/tickets')
 api.add_resource(Logout, '/logout', endpoint='logout')
 api.add_resource(CheckSession, '/check_session', endpoint='check_session')
 
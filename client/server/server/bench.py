@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+
+# Standard library imports
+import argparse
+import json
+import math
+import os
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import closing
+from datetime import datetime
+
+# Endpoint benchmark suite. Every route registered with api.add_resource is
+# driven through the Flask test client against databases seeded with
+# `seed.py --scale` at each requested size. Fixtures are seeded once into
+# instance/bench_<scale>.db and copied before every run, so write scenarios
+# never leak into the next run. Each scale runs in its own process because
+# the database URL is fixed when config.py is imported.
+#
+#   python bench.py run --scales 1000 100000 1000000 --output before.json
+#   python bench.py compare before.json after.json
+
+DEFAULT_SCALES = (1000, 100000, 1000000)
+SAMPLE_SHOWINGS = 50
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURE_DIR = os.path.join(BASE_DIR, 'instance')
+BENCH_PASSWORD = 'password'
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+def fixture_path(scale):
+    return os.path.join(FIXTURE_DIR, f'bench_{scale}.db')
+
+def copy_database(source, target):
+    # Fixtures are in WAL mode, so recent pages may only be in the -wal file;
+    # the backup API copies what a reader sees, not just the main file.
+    with closing(sqlite3.connect(source)) as fixture, closing(sqlite3.connect(target)) as copy:
+        fixture.backup(copy)
+
+def run_in_process(command, database_path, *extra):
+    env = dict(os.environ, DATABASE_URL=f'sqlite:///{database_path}')
+    subprocess.run([sys.executable, os.path.abspath(__file__), command, *extra], env=env, check=True, cwd=BASE_DIR)
+
+# --- worker side: runs with DATABASE_URL pointing at one fixture ----------
+
+def seed_fixture(scale):
+    from app import app
+    from config import db
+    from seed import seed_scaled
+
+    with app.app_context():
+        db.create_all()
+        seed_scaled(scale, password=BENCH_PASSWORD, precomputed_hash=True)
+
+def sample_context(db):
+    from models.movies import Movie
+    from models.reviews import Review
+    from models.seat_inventory import SeatInventory
+    from models.showings import Showing
+    from models.theaters import Theatre
+    from models.tickets import Ticket
+    from models.users import User
+
+    # Purchases rotate over the showings with the most seats left, so the
+    # write scenarios measure successful bookings rather than sold-out ones.
+    showings = (
+        db.session.query(Showing)
+        .join(SeatInventory, (SeatInventory.theatre_id == Showing.theatre_id) & (SeatInventory.screen == Showing.screen) & (SeatInventory.showtime == Showing.start_time))
+        .order_by(SeatInventory.seats_remaining.desc())
+        .limit(SAMPLE_SHOWINGS)
+        .all()
+    )
+    first_id = lambda model: db.session.query(db.func.min(model.id)).scalar()
+    return {
+        "ids": {
+            "movies": first_id(Movie),
+            "theaters": first_id(Theatre),
+            "tickets": first_id(Ticket),
+            "reviews": first_id(Review),
+            "users": first_id(User),
+        },
+        "username": db.session.get(User, first_id(User)).username,
+        "word": db.session.get(Movie, first_id(Movie)).title.split()[0],
+        "showings": [showing.to_dict() for showing in showings],
+    }
+
+def ticket_payload(ctx, i, quantity=1):
+    showing = ctx["showings"][i % len(ctx["showings"])]
+    return {
+        "user_id": ctx["ids"]["users"],
+        "movie_id": showing["movie_id"],
+        "theatre_id": showing["theatre_id"],
+        "screen": showing["screen"],
+        "showtime": showing["start_time"],
+        "quantity": quantity,
+        "price": 250,
+        "purchase_date": showing["start_time"][:10],
+    }
+
+def hold_payload(ctx, i):
+    payload = ticket_payload(ctx, i)
+    del payload["purchase_date"]
+    return payload
+
+def place_hold(client, ctx, i):
+    return client.post('/holds', json=hold_payload(ctx, i)).get_json()["hold"]["id"]
+
+# GET routes whose path or query has to be filled in to reach the success
+# path; each URL is measured as its own route.
+READS = {
+    '/search': ('/search?q={word}',),
+    '/analytics/<string:report>': ('/analytics/summary', '/analytics/daily', '/analytics/movies', '/analytics/theatres'),
+}
+
+# Scenarios that use up the row they act on get a fresh one for every
+# request, made before the timer starts.
+FRESH_IDS = {
+    ('POST', '/holds/<int:id>/confirm'): place_hold,
+    ('DELETE', '/holds/<int:id>'): place_hold,
+}
+
+# (method, rule) -> (repetitions, payload factory). Reads are generated from
+# the URL map; these cover writes and filtered list variants. DELETE routes
+# are only driven where FRESH_IDS gives them a row of their own, since the
+# rest would remove the sampled rows.
+SCENARIOS = {
+    ('GET', '/tickets?movie_id={movies}'): (None, None),
+    ('GET', '/reviews?movie_id={movies}'): (None, None),
+    ('GET', '/tickets?user_id={users}'): (None, None),
+    ('POST', '/tickets'): (50, lambda ctx, i: ticket_payload(ctx, i)),
+    ('POST', '/holds'): (50, lambda ctx, i: hold_payload(ctx, i)),
+    ('POST', '/holds/<int:id>/confirm'): (50, None),
+    ('DELETE', '/holds/<int:id>'): (50, None),
+    ('POST', '/tickets/batch'): (20, lambda ctx, i: [ticket_payload(ctx, i * 10 + n) for n in range(10)]),
+    ('PATCH', '/tickets/<int:id>'): (50, lambda ctx, i: {"price": 200 + i % 50}),
+    ('POST', '/reviews'): (50, lambda ctx, i: {"rating": i % 5 + 1, "comment": f"bench review {i}", "user_id": ctx["ids"]["users"], "movie_id": ctx["ids"]["movies"]}),
+    ('PATCH', '/reviews/<int:id>'): (50, lambda ctx, i: {"comment": f"edited {i}"}),
+    ('POST', '/movies'): (20, lambda ctx, i: {"title": f"Bench {i}", "genre": "Drama", "director": "Bench", "release_date": "2024-01-01", "poster_image": "https://example.com/p.jpg", "trailer_url": "https://example.com/t"}),
+    ('PATCH', '/movies/<int:id>'): (20, lambda ctx, i: {"genre": f"Drama {i}"}),
+    ('POST', '/theaters'): (20, lambda ctx, i: {"name": f"Bench {i}", "location": "Bench", "capacity": 100}),
+    ('PATCH', '/theaters/<int:id>'): (20, lambda ctx, i: {"location": f"Bench {i}"}),
+    ('POST', '/showings'): (20, lambda ctx, i: {"movie_id": ctx["ids"]["movies"], "theatre_id": ctx["ids"]["theaters"], "screen": 99, "start_time": f"2099-01-01 {i // 60 % 24:02d}:{i % 60:02d}"}),
+    ('POST', '/users/bulk'): (5, lambda ctx, i: [{"username": f"bulk{i}_{n}", "email": f"bulk{i}_{n}@example.com", "password_hash": ctx["password_hash"]} for n in range(100)]),
+    ('POST', '/signup'): (3, lambda ctx, i: {"username": f"bench{i}", "email": f"bench{i}@example.com", "password": BENCH_PASSWORD}),
+    ('POST', '/login'): (3, lambda ctx, i: {"username": ctx["username"], "password": BENCH_PASSWORD}),
+    ('DELETE', '/logout'): (1, None),
+    ('DELETE', '/clear'): (1, None),
+}
+
+def expand(rule, ctx):
+    resource = rule.strip('/').split('/')[0].split('?')[0]
+    return rule.replace('<int:id>', str(ctx["ids"].get(resource, 1))).format(**ctx["ids"], word=ctx["word"])
+
+def plan(app, api, ctx, requests):
+    reads = []
+    writes = []
+    covered = set()
+    for rule in app.url_map.iter_rules():
+        if rule.endpoint not in api.endpoints:
+            continue
+        for method in sorted(rule.methods - {'HEAD', 'OPTIONS'}):
+            key = (method, rule.rule)
+            if method == 'GET':
+                for url in READS.get(rule.rule, (rule.rule,)):
+                    name = rule.rule if url == rule.rule else url.split('?')[0]
+                    reads.append((f'GET {name}', requests, 'GET', expand(url, ctx), None))
+                covered.add(key)
+            elif key in SCENARIOS:
+                repeat, payload = SCENARIOS[key]
+                url = rule.rule if key in FRESH_IDS else expand(rule.rule, ctx)
+                writes.append((f'{method} {rule.rule}', repeat, method, url, payload))
+                covered.add(key)
+            else:
+                print(f'skipping {method} {rule.rule}: no scenario', file=sys.stderr)
+
+    for (method, rule), (repeat, payload) in SCENARIOS.items():
+        if method == 'GET':
+            reads.append((f'GET {rule.replace("{", "<").replace("}", ">")}', repeat or requests, method, expand(rule, ctx), payload))
+
+    # Session teardown goes last so the other scenarios stay logged in.
+    writes.sort(key=lambda step: step[2] == 'DELETE')
+    return reads + writes
+
+def measure(scale, requests, memory_requests, output):
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    from app import app
+    from config import api, db
+    from hashing import password_hasher
+
+    counter = {"queries": 0}
+    client = app.test_client()
+
+    # Count statements on every engine (GETs use the read-only pool), but not
+    # the BEGIN the write engine issues to open each transaction.
+    @event.listens_for(Engine, 'before_cursor_execute')
+    def count_query(conn, cursor, statement, *args):
+        if not statement.startswith('BEGIN'):
+            counter["queries"] += 1
+
+    with app.app_context():
+        ctx = sample_context(db)
+        ctx["password_hash"] = password_hasher.hash(BENCH_PASSWORD)
+
+    client.post('/login', json={"username": ctx["username"], "password": BENCH_PASSWORD})
+    # The sampled hold has to outlive every read of it.
+    app.config['SEAT_HOLD_TTL'] = 24 * 60 * 60
+    ctx["ids"]["holds"] = place_hold(client, ctx, 0)
+
+    def call(method, url, payload, i):
+        body = payload(ctx, i) if payload else None
+        fresh_id = FRESH_IDS.get((method, url))
+        if fresh_id is not None:
+            url = url.replace('<int:id>', str(fresh_id(client, ctx, i)))
+            if tracemalloc.is_tracing():
+                tracemalloc.reset_peak()
+        counter["queries"] = 0
+        start = time.perf_counter()
+        response = client.open(url, method=method, json=body)
+        response.get_data()
+        return time.perf_counter() - start, counter["queries"], response.status_code
+
+    results = {}
+    for name, repeat, method, url, payload in plan(app, api, ctx, requests):
+        call(method, url, payload, -1)
+        timings, queries, statuses = [], [], []
+        for i in range(repeat):
+            elapsed, query_count, status = call(method, url, payload, i)
+            timings.append(elapsed * 1000)
+            queries.append(query_count)
+            statuses.append(status)
+
+        tracemalloc.start()
+        peaks = []
+        for i in range(min(memory_requests, repeat)):
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+            call(method, url, payload, repeat + i)
+            peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+        tracemalloc.stop()
+
+        results[name] = {
+            "url": url,
+            "requests": repeat,
+            "status": sorted(set(statuses)),
+            "errors": sum(1 for status in statuses if not 200 <= status < 300),
+            "mean_ms": round(statistics.fmean(timings), 3),
+            "p50_ms": round(percentile(timings, 50), 3),
+            "p95_ms": round(percentile(timings, 95), 3),
+            "p99_ms": round(percentile(timings, 99), 3),
+            "queries_per_request": round(statistics.fmean(queries), 2),
+            "peak_alloc_kib": round(max(peaks) / 1024, 1) if peaks else None,
+        }
+        print(f'{scale:>8} {name:<40} p50 {results[name]["p50_ms"]:>9.2f} ms  p95 {results[name]["p95_ms"]:>9.2f} ms  queries {results[name]["queries_per_request"]:>6}', file=sys.stderr)
+
+    with open(output, 'w') as results_file:
+        json.dump(results, results_file)
+
+# --- driver side -----------------------------------------------------------
+
+def run(args):
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    report = {
+        "meta": {
+            "created": datetime.now().isoformat(timespec='seconds'),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "requests": args.requests,
+        },
+        "results": {},
+    }
+
+    for scale in args.scales:
+        fixture = fixture_path(scale)
+        if args.reseed or not os.path.exists(fixture):
+            if os.path.exists(fixture):
+                os.remove(fixture)
+            print(f'seeding {scale} ticket fixture...', file=sys.stderr)
+            run_in_process('seed', fixture, '--scale', str(scale))
+
+        with tempfile.TemporaryDirectory() as scratch:
+            database = os.path.join(scratch, 'bench.db')
+            copy_database(fixture, database)
+            output = os.path.join(scratch, 'results.json')
+            run_in_process('measure', database, '--scale', str(scale), '--requests', str(args.requests), '--memory-requests', str(args.memory_requests), '--output', output)
+            with open(output) as results_file:
+                report["results"][str(scale)] = json.load(results_file)
+
+    with open(args.output, 'w') as report_file:
+        json.dump(report, report_file, indent=2)
+    print(f'wrote {args.output}', file=sys.stderr)
+
+    # A route answering mostly errors is timing its failure path; the run
+    # fails rather than report those numbers as the route's.
+    failing = [
+        f'{scale} {name}: {result["errors"]}/{result["requests"]} non-2xx {result["status"]}'
+        for scale, routes in report["results"].items()
+        for name, result in routes.items()
+        if result["errors"] > args.max_error_rate * result["requests"]
+    ]
+    for line in failing:
+        print(f'too many errors: {line}', file=sys.stderr)
+    return 1 if failing else 0
+
+def compare(args):
+    with open(args.baseline) as baseline_file:
+        baseline = json.load(baseline_file)["results"]
+    with open(args.candidate) as candidate_file:
+        candidate = json.load(candidate_file)["results"]
+
+    regressions = 0
+    for scale, routes in candidate.items():
+        for name, new in routes.items():
+            old = baseline.get(scale, {}).get(name)
+            if old is None:
+                continue
+            ratio = new[args.metric] / old[args.metric] if old[args.metric] else 1.0
+            more_queries = new["queries_per_request"] > old["queries_per_request"]
+            flag = ''
+            if ratio > 1 + args.threshold or more_queries:
+                flag = 'REGRESSION'
+                regressions += 1
+            print(f'{scale:>8} {name:<40} {args.metric} {old[args.metric]:>9.2f} -> {new[args.metric]:>9.2f} ms ({ratio:>5.2f}x)  queries {old["queries_per_request"]} -> {new["queries_per_request"]}  {flag}')
+
+    print(f'{regressions} regression(s)')
+    return 1 if regressions else 0
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark every API route against scaled fixtures.')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help='benchmark each scale and write a JSON report')
+    run_parser.add_argument('--scales', type=int, nargs='+', default=DEFAULT_SCALES, help='ticket counts to seed fixtures at')
+    run_parser.add_argument('--requests', type=int, default=200, help='timed requests per read route')
+    run_parser.add_argument('--memory-requests', type=int, default=5, help='requests per route traced for allocations')
+    run_parser.add_argument('--reseed', action='store_true', help='rebuild fixtures even if they exist')
+    run_parser.add_argument('--max-error-rate', type=float, default=0.05, help='fraction of non-2xx responses a route may return before the run fails')
+    run_parser.add_argument('--output', default='bench_results.json')
+
+    compare_parser = commands.add_parser('compare', help='compare two reports and flag regressions')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('candidate')
+    compare_parser.add_argument('--metric', default='p95_ms', choices=('mean_ms', 'p50_ms', 'p95_ms', 'p99_ms'))
+    compare_parser.add_argument('--threshold', type=float, default=0.2, help='allowed slowdown before flagging, as a fraction')
+
+    seed_parser = commands.add_parser('seed', help=argparse.SUPPRESS)
+    seed_parser.add_argument('--scale', type=int, required=True)
+
+    measure_parser = commands.add_parser('measure', help=argparse.SUPPRESS)
+    measure_parser.add_argument('--scale', type=int, required=True)
+    measure_parser.add_argument('--requests', type=int, required=True)
+    measure_parser.add_argument('--memory-requests', type=int, required=True)
+    measure_parser.add_argument('--output', required=True)
+
+    args = parser.parse_args()
+    if args.command == 'run':
+        sys.exit(run(args))
+    elif args.command == 'compare':
+        sys.exit(compare(args))
+    elif args.command == 'seed':
+        seed_fixture(args.scale)
+    else:
+        measure(args.scale, args.requests, args.memory_requests, args.output)
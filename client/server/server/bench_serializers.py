@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+
+# Standard library imports
+import argparse
+import json
+import time
+from datetime import datetime
+
+# Remote library imports
+from sqlalchemy.orm import configure_mappers
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy_serializer import SerializerMixin
+
+# Local imports
+from app import app
+from models.movies import Movie
+from models.reviews import Review
+from models.theaters import Theatre
+from models.tickets import Ticket
+from models.users import User
+
+# Micro-benchmark of the compiled to_dict() against SerializerMixin's
+# reflective one. Objects are built in memory with their attributes marked
+# as loaded, so neither side touches the database.
+
+SAMPLES = {
+    Movie: dict(id=1, title='Title', genre='Drama', director='Director', release_date='2024-01-01', poster_image='https://example.com/p.jpg', trailer_url='https://example.com/t', tag='in theatres', review_count=10, rating_sum=37, tickets_sold=120),
+    Theatre: dict(id=1, name='Westgate Cinema', location='Westgate mall', capacity=80),
+    Ticket: dict(id=1, quantity=2, price=250.0, purchase_date='2024-01-01', showtime='2024-01-02 13:00', screen=3, user_id=1, movie_id=1, theatre_id=1),
+    Review: dict(id=1, rating=4, comment='Great film.', submission_date=datetime(2024, 1, 1, 12, 30), user_id=1, movie_id=1),
+    User: dict(id=1, username='user', email='user@example.com'),
+}
+
+def build(model, count):
+    objects = []
+    for _ in range(count):
+        obj = model.__mapper__.class_manager.new_instance()
+        for key, value in SAMPLES[model].items():
+            set_committed_value(obj, key, value)
+        for key in ('tickets', 'reviews'):
+            if hasattr(model, key):
+                set_committed_value(obj, key, [])
+        objects.append(obj)
+    return objects
+
+def rate(serialize, objects):
+    start = time.perf_counter()
+    for obj in objects:
+        serialize(obj)
+    return len(objects) / (time.perf_counter() - start)
+
+def run(count):
+    configure_mappers()
+    results = {}
+    for model in SAMPLES:
+        objects = build(model, count)
+        assert objects[0].to_dict() == SerializerMixin.to_dict(objects[0]), model.__name__
+        reflective = rate(SerializerMixin.to_dict, objects)
+        compiled = rate(lambda obj: obj.to_dict(), objects)
+        results[model.__name__] = {
+            "reflective_per_sec": round(reflective),
+            "compiled_per_sec": round(compiled),
+            "speedup": round(compiled / reflective, 1),
+        }
+
+    payload = [obj.to_dict() for obj in build(Ticket, count)]
+    encode = rate(lambda _: app.json.dumps(payload), range(10)) * len(payload)
+    stdlib = rate(lambda _: json.dumps(payload, sort_keys=True), range(10)) * len(payload)
+    results['json'] = {
+        "encoder": type(app.json).__name__,
+        "app_objects_per_sec": round(encode),
+        "stdlib_objects_per_sec": round(stdlib),
+    }
+    return results
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compare compiled and reflective model serialization.')
+    parser.add_argument('--count', type=int, default=20000, help='objects per model')
+    args = parser.parse_args()
+
+    with app.app_context():
+        print(json.dumps(run(args.count), indent=2))
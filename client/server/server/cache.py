@@ -0,0 +1,94 @@
+import hashlib
+import threading
+import time
+from functools import wraps
+
+from flask import make_response, request
+
+from config import app
+from generations import cache_generations
+
+class ResponseCache:
+    # Serialized GET responses keyed by namespace, path and query string.
+    # Write handlers call invalidate() for the namespaces they change; with
+    # several workers, entries also carry the namespace's shared generation.
+    # A response is only stored if no invalidation of its namespace happened
+    # while the view ran, and entries expire after ttl seconds regardless.
+
+    def __init__(self, ttl, max_entries=1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.entries = {}
+        self.lock = threading.Lock()
+        self.generations = {}
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.invalidations = 0
+
+    def cached(self, namespace):
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                key = (namespace, request.path, request.query_string)
+                generation = cache_generations.current(namespace)
+                entry = self.entries.get(key)
+
+                if entry is None or entry[0] <= time.monotonic() or entry[1] != generation:
+                    local_generation = self.generations.get(namespace, 0)
+                    response = view(*args, **kwargs)
+                    self.count('misses')
+                    if response.status_code != 200:
+                        return response
+                    body = response.get_data()
+                    entry = (time.monotonic() + self.ttl, generation, hashlib.sha1(body).hexdigest(), body, response.mimetype)
+                    self.store(key, entry, local_generation)
+                else:
+                    self.count('hits')
+
+                _, _, etag, body, mimetype = entry
+                if request.if_none_match.contains_weak(etag):
+                    self.count('not_modified')
+                    response = make_response('', 304)
+                else:
+                    response = make_response(body, 200)
+                    response.mimetype = mimetype
+                response.set_etag(etag)
+                response.headers['Cache-Control'] = 'no-cache'
+                return response
+            return wrapper
+        return decorator
+
+    def store(self, key, entry, local_generation):
+        with self.lock:
+            # An invalidation while the view ran may have made it stale already.
+            if self.generations.get(key[0], 0) != local_generation:
+                return
+            if len(self.entries) >= self.max_entries and key not in self.entries:
+                self.entries.pop(next(iter(self.entries)))
+            self.entries[key] = entry
+
+    def invalidate(self, *namespaces):
+        cache_generations.bump(*namespaces)
+        with self.lock:
+            for namespace in namespaces:
+                self.generations[namespace] = self.generations.get(namespace, 0) + 1
+            for key in [key for key in self.entries if key[0] in namespaces]:
+                del self.entries[key]
+            self.invalidations += 1
+
+    def count(self, counter):
+        with self.lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def stats(self):
+        return {
+            "entries": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "not_modified": self.not_modified,
+            "invalidations": self.invalidations,
+            "ttl_seconds": self.ttl,
+        }
+
+response_cache = ResponseCache(ttl=app.config['RESPONSE_CACHE_TTL'])
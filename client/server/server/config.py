@@ -2,6 +2,7 @@
 
 # Remote library imports
 from flask import Flask
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 from flask_bcrypt import Bcrypt
 from flask_migrate import Migrate
@@ -9,28 +10,102 @@ from flask_restful import Api
 from flask_sqlalchemy import SQLAlchemy
 from sqlalchemy import MetaData
 
+try:
+    import orjson
+except ImportError:  # optional: falls back to the stdlib encoder
+    orjson = None
+
 # Local imports
 import os
 
+from engines import RoutingSession, engine_profile
+from metrics import request_metrics
+from querywatch import query_watch
+
 def generate_secret_key():
     return os.urandom(24).hex()
 
+def load_secret_key(instance_path):
+    # Every worker process has to sign sessions with the same key. It comes
+    # from SECRET_KEY, or else is generated once and kept in the instance
+    # folder; os.link() makes the first process to get there win.
+    if os.environ.get('SECRET_KEY'):
+        return os.environ['SECRET_KEY']
+    path = os.path.join(instance_path, 'secret_key')
+    if not os.path.exists(path):
+        os.makedirs(instance_path, exist_ok=True)
+        candidate = f'{path}.{os.getpid()}'
+        with open(os.open(candidate, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), 'w') as key_file:
+            key_file.write(generate_secret_key())
+        try:
+            os.link(candidate, path)
+        except FileExistsError:
+            pass
+        finally:
+            os.remove(candidate)
+    with open(path) as key_file:
+        return key_file.read().strip()
+
+def include_in_migrations(name, type_, parent_names):
+    # The FTS5 tables (and their shadow tables) are created by search.py.
+    return not (type_ == 'table' and name and '_fts' in name)
+
+class OrjsonProvider(DefaultJSONProvider):
+    # Same output as the default provider (dates still go through its
+    # default hook), encoded by orjson.
+    def dumps(self, obj, **kwargs):
+        option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        if kwargs.get('sort_keys', self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+
 
 
 # Instantiate app, set attributes
 app = Flask(__name__)
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///app.db'
+if orjson is not None:
+    app.json = OrjsonProvider(app)
+app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL', 'sqlite:///app.db')
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-app.config['SECRET_KEY'] = generate_secret_key()
-app.json.compact = False
+app.config['SQLITE_PRAGMAS'] = {
+    'journal_mode': os.environ.get('SQLITE_JOURNAL_MODE', 'wal'),
+    'busy_timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', 5000)),
+    'synchronous': os.environ.get('SQLITE_SYNCHRONOUS', 'normal'),
+    'mmap_size': int(os.environ.get('SQLITE_MMAP_SIZE', 256 * 1024 * 1024)),
+    'cache_size': int(os.environ.get('SQLITE_CACHE_SIZE', -64 * 1024)),
+    'foreign_keys': 'on',
+}
+app.config['SQLITE_READ_POOL_SIZE'] = int(os.environ.get('SQLITE_READ_POOL_SIZE', 8))
+app.config['SECRET_KEY'] = load_secret_key(app.instance_path)
+app.config['MULTIPROCESS'] = os.environ.get('MULTIPROCESS') == '1'
+app.config['BCRYPT_LOG_ROUNDS'] = int(os.environ.get('BCRYPT_LOG_ROUNDS', 12))
+app.config['BCRYPT_WORKERS'] = int(os.environ.get('BCRYPT_WORKERS', os.cpu_count() or 1))
+app.config['BCRYPT_MAX_QUEUE'] = int(os.environ.get('BCRYPT_MAX_QUEUE', 64))
+app.config['BCRYPT_BULK_WORKERS'] = int(os.environ.get('BCRYPT_BULK_WORKERS', max(1, app.config['BCRYPT_WORKERS'] // 2)))
+app.config['RESPONSE_CACHE_TTL'] = float(os.environ.get('RESPONSE_CACHE_TTL', 300))
+app.config['USER_SUMMARY_TTL'] = float(os.environ.get('USER_SUMMARY_TTL', 60))
+app.config['USER_SUMMARY_MAX_ENTRIES'] = int(os.environ.get('USER_SUMMARY_MAX_ENTRIES', 4096))
+app.config['IDEMPOTENCY_TTL'] = int(os.environ.get('IDEMPOTENCY_TTL', 24 * 60 * 60))
+app.config['SEAT_HOLD_TTL'] = int(os.environ.get('SEAT_HOLD_TTL', 10 * 60))
+app.json.compact = os.environ.get('JSON_PRETTYPRINT') != '1'
+app.config['QUERY_WATCH'] = os.environ.get('QUERY_WATCH') == '1'
+app.config['QUERY_WATCH_REPEAT'] = int(os.environ.get('QUERY_WATCH_REPEAT', 5))
+app.config['QUERY_WATCH_BUDGET_MS'] = float(os.environ.get('QUERY_WATCH_BUDGET_MS', 200))
+app.config['QUERY_WATCH_STRICT'] = os.environ.get('QUERY_WATCH_STRICT') == '1'
+request_metrics.init_app(app)
+query_watch.init_app(app)
 
 # Define metadata, instantiate db
 metadata = MetaData(naming_convention={
+    "ix": "ix_%(table_name)s_%(column_0_name)s",
     "fk": "fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s",
 })
-db = SQLAlchemy(metadata=metadata)
-migrate = Migrate(app, db)
+db = SQLAlchemy(metadata=metadata, session_options={'class_': RoutingSession})
+migrate = Migrate(app, db, render_as_batch=True, include_name=include_in_migrations)
 db.init_app(app)
+engine_profile.init_app(app, db)
 
 # Instantiate REST API
 api = Api(app)
@@ -0,0 +1,95 @@
+import sqlite3
+import threading
+
+from flask import current_app, has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import create_engine, event
+from sqlalchemy.pool import QueuePool
+
+# SQLite engine profile. Every connection gets the SQLITE_PRAGMAS from
+# config.py, and the write engine opens its transactions with BEGIN
+# IMMEDIATE so two writers queue on busy_timeout up front instead of one
+# failing with "database is locked" when it upgrades a read lock. In WAL mode
+# readers never block the writer, so GET requests are routed to a separate
+# pool of read-only connections (SQLITE_READ_POOL_SIZE, 0 to disable).
+
+READ_METHODS = ('GET', 'HEAD')
+READ_PRAGMAS = ('busy_timeout', 'mmap_size', 'cache_size')
+
+def is_file_database(engine):
+    return engine.dialect.name == 'sqlite' and engine.url.database not in (None, '', ':memory:') and 'mode=memory' not in str(engine.url)
+
+def apply_pragmas(dbapi_connection, pragmas):
+    cursor = dbapi_connection.cursor()
+    for name, value in pragmas.items():
+        cursor.execute(f'PRAGMA {name} = {value}')
+    cursor.close()
+
+def configure_engine(engine, pragmas):
+    if engine.dialect.name != 'sqlite':
+        return
+
+    @event.listens_for(engine, 'connect')
+    def on_connect(dbapi_connection, connection_record):
+        # Hand transaction control to SQLAlchemy so 'begin' below decides
+        # how each transaction starts.
+        dbapi_connection.isolation_level = None
+        apply_pragmas(dbapi_connection, pragmas)
+
+    @event.listens_for(engine, 'begin')
+    def on_begin(connection):
+        connection.exec_driver_sql('BEGIN IMMEDIATE')
+
+class EngineProfile:
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.read_engines = {}
+
+    def init_app(self, app, db):
+        with app.app_context():
+            configure_engine(db.engine, app.config['SQLITE_PRAGMAS'])
+
+    def read_engine(self, write_engine):
+        engine = self.read_engines.get(write_engine)
+        if engine is not None or write_engine in self.read_engines:
+            return engine
+
+        with self.lock:
+            if write_engine not in self.read_engines:
+                self.read_engines[write_engine] = self.create_read_engine(write_engine)
+        return self.read_engines[write_engine]
+
+    def create_read_engine(self, write_engine):
+        size = current_app.config['SQLITE_READ_POOL_SIZE']
+        if size <= 0 or not is_file_database(write_engine):
+            return None
+
+        # Make sure the file exists and is in WAL mode before opening it
+        # read-only; the pooled writer keeps the -wal/-shm files around.
+        with write_engine.connect():
+            pass
+
+        pragmas = {name: value for name, value in current_app.config['SQLITE_PRAGMAS'].items() if name in READ_PRAGMAS}
+        path = write_engine.url.database
+
+        def connect():
+            connection = sqlite3.connect(f'file:{path}?mode=ro', uri=True, check_same_thread=False)
+            apply_pragmas(connection, pragmas)
+            return connection
+
+        return create_engine('sqlite://', creator=connect, poolclass=QueuePool, pool_size=size, max_overflow=size)
+
+engine_profile = EngineProfile()
+
+class RoutingSession(Session):
+    # Reads issued while handling a GET go to the read-only pool; anything
+    # that flushes, and every other method, uses the write engine.
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        write_engine = super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+        if bind is None and not self._flushing and has_request_context() and request.method in READ_METHODS:
+            read_engine = engine_profile.read_engine(write_engine)
+            if read_engine is not None:
+                return read_engine
+        return write_engine
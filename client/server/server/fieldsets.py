@@ -0,0 +1,140 @@
+from flask import request
+from sqlalchemy.orm import joinedload, load_only, selectinload
+
+from models.movies import Movie
+from models.reviews import Review
+from models.theaters import Theatre
+from models.tickets import Ticket
+from models.users import User
+from serializers import serialize_movie_summary, serialize_theatre_summary, serialize_user_summary, value_converter
+
+# ?fields= and ?include= for the collection resources. fields picks the
+# attributes to return (id always comes along) and turns into load_only(),
+# so the SELECT reads only the columns behind them; include picks the
+# related records to nest, and only those are joined in. Without either
+# parameter a resource returns the payload it always has.
+
+class FieldsetError(ValueError):
+    pass
+
+def requested(name):
+    # None when the parameter is absent, [] for an empty "?include=".
+    if name not in request.args:
+        return None
+    return list(dict.fromkeys(part.strip() for part in request.args[name].split(',') if part.strip()))
+
+class Relation:
+
+    def __init__(self, attribute, columns, serialize):
+        self.attribute = attribute
+        self.columns = columns
+        self.serialize = serialize
+
+class Fieldset:
+
+    def __init__(self, model, fields, extra_fields=(), reads=None, loaders=None, relations=None):
+        self.model = model
+        self.default_fields = fields
+        self.fields = fields + extra_fields
+        # Fields that are not a column of their own: the columns they are
+        # computed from, and the loader for the relationship they read.
+        self.reads = reads or {}
+        self.loaders = loaders or {}
+        self.relations = relations or {}
+        self.converters = {field: value_converter(model, field) for field in self.fields}
+
+    def select(self):
+        fields = requested('fields')
+        if fields is None:
+            fields = self.default_fields
+        else:
+            unknown = [field for field in fields if field not in self.fields]
+            if unknown:
+                raise FieldsetError(f"Validation error: Unknown fields: {', '.join(unknown)}. Expected any of: {', '.join(self.fields)}.")
+            fields = ('id', *(field for field in fields if field != 'id'))
+
+        includes = requested('include')
+        if includes is None:
+            includes = tuple(self.relations)
+        else:
+            unknown = [name for name in includes if name not in self.relations]
+            if unknown:
+                expected = f"Expected any of: {', '.join(self.relations)}." if self.relations else "This resource has none."
+                raise FieldsetError(f"Validation error: Unknown includes: {', '.join(unknown)}. {expected}")
+        return Selection(self, fields, includes)
+
+class Selection:
+
+    def __init__(self, fieldset, fields, includes):
+        self.fieldset = fieldset
+        self.fields = fields
+        self.includes = includes
+
+    def apply(self, query):
+        fieldset = self.fieldset
+        columns = []
+        options = []
+        for field in self.fields:
+            columns.extend(fieldset.reads.get(field, (field,)))
+            loader = fieldset.loaders.get(field)
+            if loader is not None and loader not in options:
+                options.append(loader)
+        options.append(load_only(*(getattr(fieldset.model, column) for column in dict.fromkeys(columns))))
+        for name in self.includes:
+            relation = fieldset.relations[name]
+            options.append(joinedload(relation.attribute).load_only(*relation.columns))
+        return query.options(*options)
+
+    def serialize(self, obj):
+        converters = self.fieldset.converters
+        data = {}
+        for field in self.fields:
+            value = getattr(obj, field)
+            converter = converters[field]
+            data[field] = converter(value) if converter is not None and value is not None else value
+        for name in self.includes:
+            relation = self.fieldset.relations[name]
+            related = getattr(obj, relation.attribute.key)
+            data[name] = relation.serialize(related) if related is not None else None
+        return data
+
+MOVIE_COLUMNS = (Movie.id, Movie.title, Movie.genre, Movie.director, Movie.release_date)
+
+movie_fields = Fieldset(
+    Movie,
+    Movie.serialize_only,
+    reads={'rating_average': ('review_count', 'rating_sum')},
+)
+
+theatre_fields = Fieldset(
+    Theatre,
+    Theatre.serialize_only,
+    # The ticket_showtimes/ticket_screens proxies read every theatre's
+    # tickets; one IN query loads them all instead of one per theatre.
+    reads={'ticket_showtimes': (), 'ticket_screens': ()},
+    loaders=dict.fromkeys(
+        ('ticket_showtimes', 'ticket_screens'),
+        selectinload(Theatre.tickets).load_only(Ticket.showtime, Ticket.screen),
+    ),
+)
+
+review_fields = Fieldset(
+    Review,
+    ('id', 'comment', 'rating'),
+    extra_fields=('submission_date', 'user_id', 'movie_id'),
+    relations={
+        'user': Relation(Review.user, (User.id, User.username), serialize_user_summary),
+        'movie': Relation(Review.movie, MOVIE_COLUMNS, serialize_movie_summary),
+    },
+)
+
+ticket_fields = Fieldset(
+    Ticket,
+    ('id', 'price', 'purchase_date', 'screen', 'quantity', 'showtime'),
+    extra_fields=('user_id', 'movie_id', 'theatre_id'),
+    relations={
+        'user': Relation(Ticket.user, (User.id, User.username), serialize_user_summary),
+        'movie': Relation(Ticket.movie, MOVIE_COLUMNS, serialize_movie_summary),
+        'theatre': Relation(Ticket.theatre, (Theatre.id, Theatre.name, Theatre.location, Theatre.capacity), serialize_theatre_summary),
+    },
+)
@@ -0,0 +1,40 @@
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert
+
+from config import app, db
+from models.cache_generations import CacheGeneration
+
+# With several worker processes each one has its own response and user
+# summary caches, so an invalidation made by one worker has to reach the
+# others. In MULTIPROCESS mode every cache key has a generation counter in
+# the cache_generations table: invalidate() bumps it, and a cached entry is
+# only served while the generation it was stored under is still current.
+# That costs one primary-key lookup per cached read. A single process needs
+# none of this; current() is then always None and bump() does nothing.
+
+generations = CacheGeneration.__table__
+
+class CacheGenerations:
+
+    def __init__(self, enabled):
+        self.enabled = enabled
+
+    def current(self, key):
+        if not self.enabled:
+            return None
+        generation = db.session.execute(select(generations.c.generation).where(generations.c.key == key)).scalar()
+        return generation or 0
+
+    def bump(self, *keys):
+        if not self.enabled or not keys:
+            return
+        upsert = insert(generations)
+        # Straight on the engine: callers have committed already, or are
+        # handling a GET whose session reads from the read-only pool.
+        with db.engine.begin() as connection:
+            connection.execute(
+                upsert.on_conflict_do_update(index_elements=['key'], set_={'generation': generations.c.generation + 1}),
+                [{"key": key, "generation": 1} for key in keys],
+            )
+
+cache_generations = CacheGenerations(enabled=app.config['MULTIPROCESS'])
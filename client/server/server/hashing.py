@@ -0,0 +1,116 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from config import app, bcrypt
+
+# bcrypt releases the GIL while it works, so hashing on a small dedicated
+# pool keeps a burst of logins from occupying every request thread's CPU.
+# The pool is bounded twice: BCRYPT_WORKERS hashes run at once and at most
+# BCRYPT_MAX_QUEUE more may wait; beyond that callers get HashingBusy. Bulk
+# imports have slots of their own, only BCRYPT_BULK_WORKERS of them, so an
+# import never takes the capacity that logins and signups rely on.
+
+class HashingBusy(Exception):
+    pass
+
+class PasswordHasher:
+
+    def __init__(self, rounds, workers, max_queue, bulk_workers):
+        self.rounds = rounds
+        self.workers = workers
+        self.bulk_workers = bulk_workers
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='bcrypt')
+        self.slots = threading.BoundedSemaphore(workers + max_queue)
+        self.bulk_slots = threading.BoundedSemaphore(bulk_workers)
+        self.lock = threading.Lock()
+        self.queued = 0
+        self.active = 0
+        self.completed = 0
+        self.rejected = 0
+        self.rehashed = 0
+        self.wait_seconds = 0.0
+        self.hash_seconds = 0.0
+        self.max_hash_seconds = 0.0
+
+    def run(self, func, *args):
+        return self.submit(func, *args).result()
+
+    def submit(self, func, *args, bulk=False):
+        # Bulk callers wait for a free slot instead of being rejected.
+        slots = self.bulk_slots if bulk else self.slots
+        if not slots.acquire(blocking=bulk):
+            with self.lock:
+                self.rejected += 1
+            raise HashingBusy("Too many password operations in progress, try again shortly.")
+
+        submitted = time.perf_counter()
+        with self.lock:
+            self.queued += 1
+
+        def job():
+            started = time.perf_counter()
+            with self.lock:
+                self.queued -= 1
+                self.active += 1
+            try:
+                return func(*args)
+            finally:
+                finished = time.perf_counter()
+                with self.lock:
+                    self.active -= 1
+                    self.completed += 1
+                    self.wait_seconds += started - submitted
+                    self.hash_seconds += finished - started
+                    self.max_hash_seconds = max(self.max_hash_seconds, finished - started)
+                slots.release()
+
+        return self.executor.submit(job)
+
+    def hash(self, password):
+        password_hash = self.run(bcrypt.generate_password_hash, password.encode('utf-8'), self.rounds)
+        return password_hash.decode('utf-8')
+
+    def hash_many(self, passwords):
+        futures = [
+            self.submit(bcrypt.generate_password_hash, password.encode('utf-8'), self.rounds, bulk=True)
+            for password in passwords
+        ]
+        return [future.result().decode('utf-8') for future in futures]
+
+    def verify(self, password_hash, password):
+        return self.run(bcrypt.check_password_hash, password_hash, password.encode('utf-8'))
+
+    def rehash(self, password):
+        password_hash = self.hash(password)
+        with self.lock:
+            self.rehashed += 1
+        return password_hash
+
+    def needs_rehash(self, password_hash):
+        # "$2b$<cost>$<salt+digest>"
+        return int(password_hash.split('$')[2]) != self.rounds
+
+    def stats(self):
+        with self.lock:
+            completed = self.completed or 1
+            return {
+                "rounds": self.rounds,
+                "workers": self.workers,
+                "bulk_workers": self.bulk_workers,
+                "queue_depth": self.queued,
+                "active": self.active,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "rehashed": self.rehashed,
+                "avg_wait_ms": round(self.wait_seconds / completed * 1000, 2),
+                "avg_hash_ms": round(self.hash_seconds / completed * 1000, 2),
+                "max_hash_ms": round(self.max_hash_seconds * 1000, 2),
+            }
+
+password_hasher = PasswordHasher(
+    rounds=app.config['BCRYPT_LOG_ROUNDS'],
+    workers=app.config['BCRYPT_WORKERS'],
+    max_queue=app.config['BCRYPT_MAX_QUEUE'],
+    bulk_workers=app.config['BCRYPT_BULK_WORKERS'],
+)
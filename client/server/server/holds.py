@@ -0,0 +1,119 @@
+import threading
+from collections import Counter
+from datetime import datetime
+
+import click
+from flask import current_app
+from sqlalchemy import delete, func, select
+
+from config import app, db
+from engines import engine_profile
+from inventory import release_seats
+from models.seat_holds import SeatHold
+
+# Seat holds for checkout. Placing a hold takes its seats off the inventory
+# counter with the same guarded UPDATE as a purchase; confirming turns it
+# into a ticket without touching the counter again, and releasing or expiry
+# gives the seats back. Every exit deletes the hold row first with DELETE ...
+# RETURNING, so whichever of confirm, release or the sweeper gets there first
+# wins and the seats are never returned twice.
+#
+# Each process runs one sweeper thread, started by its first request. It
+# sleeps until the earliest expires_at (a MIN over the expires_at index),
+# then deletes expired holds oldest first in batches of SWEEP_BATCH, each in
+# its own short write transaction, so thousands of holds expiring together
+# never sit in front of a booking for long. Holds placed by this process
+# wake it early; ones placed by other workers are picked up within
+# MAX_SLEEP. Expired holds can't be confirmed even before they are swept.
+
+SWEEP_BATCH = 500
+MAX_SLEEP = 60.0
+
+holds = SeatHold.__table__
+
+def take_hold(hold_id, now=None):
+    # Removes the hold in the current session transaction and returns it, or
+    # None if it is gone (or, given now, has expired).
+    query = delete(holds).where(holds.c.id == hold_id)
+    if now is not None:
+        query = query.where(holds.c.expires_at > now)
+    return db.session.execute(query.returning(*holds.c)).first()
+
+def release_held(rows, connection=None):
+    released = Counter()
+    for row in rows:
+        released[row.theatre_id, row.screen, row.showtime] += row.quantity
+    for (theatre_id, screen, showtime), quantity in released.items():
+        release_seats(theatre_id, screen, showtime, quantity, connection=connection)
+
+def sweep_expired_holds(now=None):
+    now = now or datetime.now()
+    expired = select(holds.c.id).where(holds.c.expires_at <= now).order_by(holds.c.expires_at).limit(SWEEP_BATCH)
+    swept = 0
+    while True:
+        with db.engine.begin() as connection:
+            rows = connection.execute(
+                delete(holds)
+                .where(holds.c.id.in_(expired.scalar_subquery()))
+                .returning(holds.c.theatre_id, holds.c.screen, holds.c.showtime, holds.c.quantity)
+            ).all()
+            release_held(rows, connection)
+        swept += len(rows)
+        if len(rows) < SWEEP_BATCH:
+            return swept
+
+def next_expiry():
+    query = select(func.min(holds.c.expires_at))
+    engine = engine_profile.read_engine(db.engine) or db.engine
+    with engine.connect() as connection:
+        return connection.execute(query).scalar()
+
+class HoldSweeper:
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.thread = None
+        self.next_run = None
+
+    def start(self):
+        if self.thread is not None:
+            return
+        with self.lock:
+            if self.thread is None:
+                self.thread = threading.Thread(
+                    target=self.run, args=(current_app._get_current_object(),), name='seat-hold-sweeper', daemon=True
+                )
+                self.thread.start()
+
+    def schedule(self, expires_at):
+        # Called once a hold has committed.
+        next_run = self.next_run
+        if next_run is None or expires_at < next_run:
+            self.wakeup.set()
+
+    def run(self, app):
+        with app.app_context():
+            while True:
+                self.wakeup.clear()
+                self.next_run = None
+                try:
+                    sweep_expired_holds()
+                    expires_at = next_expiry()
+                except Exception:
+                    app.logger.exception('Seat hold sweep failed')
+                    expires_at = None
+
+                timeout = MAX_SLEEP
+                if expires_at is not None:
+                    timeout = min(MAX_SLEEP, max(0.0, (expires_at - datetime.now()).total_seconds()))
+                self.next_run = expires_at
+                self.wakeup.wait(timeout)
+
+hold_sweeper = HoldSweeper()
+app.before_request(hold_sweeper.start)
+
+@app.cli.command('sweep-seat-holds')
+def sweep_seat_holds_command():
+    """Release the seats of expired holds."""
+    click.echo(f'Released {sweep_expired_holds()} expired holds.')
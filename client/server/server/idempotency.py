@@ -0,0 +1,116 @@
+import hashlib
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+from functools import wraps
+
+from flask import current_app, g, jsonify, make_response, request
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects.sqlite import insert
+
+from config import app, db
+from engines import engine_profile
+from models.idempotency_keys import IdempotencyKey
+
+# Idempotency-Key support for purchases. The first request with a key claims
+# it with an INSERT that is the first statement of its write transaction,
+# and the view records its response in the same transaction, so the key and
+# the tickets commit or roll back together. A retry finds the committed
+# response with a read-only lookup and replays it without opening a write
+# transaction. Two identical requests that race are serialized by BEGIN
+# IMMEDIATE: the loser's claim conflicts once the winner has committed, and
+# it replays the winner's response. Requests that roll back leave no key
+# behind and simply run again when retried. Keys expire after
+# IDEMPOTENCY_TTL seconds and are swept out by the requests that claim new
+# ones, at most once per SWEEP_INTERVAL per process.
+
+HEADER = 'Idempotency-Key'
+MAX_KEY_LENGTH = 255
+SWEEP_INTERVAL = 60.0
+
+keys = IdempotencyKey.__table__
+
+class Sweeper:
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.next_run = 0.0
+
+    def due(self):
+        with self.lock:
+            if time.monotonic() < self.next_run:
+                return False
+            self.next_run = time.monotonic() + SWEEP_INTERVAL
+            return True
+
+sweeper = Sweeper()
+
+def request_fingerprint():
+    body = json.dumps(request.get_json(silent=True), sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(f'{request.method} {request.path} {body}'.encode()).hexdigest()
+
+def find_response(key, now):
+    query = select(keys.c.fingerprint, keys.c.status, keys.c.response).where(keys.c.key == key, keys.c.expires_at > now)
+    read_engine = engine_profile.read_engine(db.engine)
+    if read_engine is None:
+        return db.session.execute(query).first()
+    with read_engine.connect() as connection:
+        return connection.execute(query).first()
+
+def claim_key(key, fingerprint, now):
+    if sweeper.due():
+        db.session.execute(delete(keys).where(keys.c.expires_at <= now))
+    expires_at = now + timedelta(seconds=current_app.config['IDEMPOTENCY_TTL'])
+    claim = insert(keys).values(key=key, fingerprint=fingerprint, expires_at=expires_at)
+    result = db.session.execute(
+        claim.on_conflict_do_update(
+            index_elements=['key'],
+            set_={'fingerprint': fingerprint, 'status': None, 'response': None, 'expires_at': expires_at},
+            where=keys.c.expires_at <= now,
+        )
+    )
+    return result.rowcount == 1
+
+def replay(stored, fingerprint):
+    if stored is not None and stored.fingerprint != fingerprint:
+        return make_response(jsonify({"error": f"{HEADER} was already used for a different request."}), 422)
+    if stored is None or stored.response is None:
+        return make_response(jsonify({"error": f"A request with this {HEADER} is still being processed."}), 409)
+    return make_response(stored.response, stored.status, {'Content-Type': 'application/json', 'Idempotent-Replayed': 'true'})
+
+def idempotent(view):
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        key = request.headers.get(HEADER)
+        if key is None:
+            return view(*args, **kwargs)
+        if not key or len(key) > MAX_KEY_LENGTH:
+            return make_response(jsonify({"error": f"Validation error: {HEADER} must be 1 to {MAX_KEY_LENGTH} characters."}), 400)
+
+        fingerprint = request_fingerprint()
+        now = datetime.now()
+        stored = find_response(key, now)
+        if stored is None:
+            if claim_key(key, fingerprint, now):
+                g.idempotency_key = key
+                return view(*args, **kwargs)
+            db.session.rollback()
+            stored = find_response(key, now)
+        return replay(stored, fingerprint)
+    return wrapper
+
+def record_response(body, status):
+    # Called by the view just before it commits.
+    key = g.get('idempotency_key')
+    if key is None:
+        return
+    db.session.execute(
+        update(keys).where(keys.c.key == key).values(status=status, response=current_app.json.dumps(body))
+    )
+
+@app.cli.command('purge-idempotency-keys')
+def purge_idempotency_keys_command():
+    """Delete expired Idempotency-Key records."""
+    with db.engine.begin() as connection:
+        connection.execute(delete(keys).where(keys.c.expires_at <= datetime.now()))
@@ -0,0 +1,154 @@
+from sqlalchemy import and_, func, literal, select, union, union_all
+from sqlalchemy.dialects.sqlite import insert
+
+from config import app, db
+from models.seat_holds import SeatHold
+from models.seat_inventory import SeatInventory
+from models.showings import Showing
+from models.theaters import Theatre
+from models.tickets import Ticket
+
+# One counter row per (theatre, screen, showtime). Bookings never read the
+# counter and write it back: they issue a single UPDATE guarded by
+# "seats_remaining >= quantity" and treat a zero rowcount as sold out, so
+# concurrent purchases cannot oversell a showing. Seats under an active
+# hold (holds.py) are taken off the counter the same way as sold ones.
+# A counter starts from its Showing's seats, or from Theatre.capacity for a
+# showtime that was sold without one.
+
+seat_inventory = SeatInventory.__table__
+showings = Showing.__table__
+theaters = Theatre.__table__
+
+class CapacityError(Exception):
+    pass
+
+def showing_seats(theatre_id, screen, showtime):
+    return (
+        select(showings.c.seats)
+        .where(showings.c.theatre_id == theatre_id, showings.c.screen == screen, showings.c.start_time == showtime)
+        .scalar_subquery()
+    )
+
+def ensure_showing(theatre_id, screen, showtime):
+    # First booking for a showing without a counter seeds it.
+    seed = select(
+        literal(theatre_id), literal(screen), literal(showtime),
+        func.coalesce(showing_seats(theatre_id, screen, showtime), theaters.c.capacity),
+    ).where(theaters.c.id == theatre_id)
+    db.session.execute(
+        insert(seat_inventory)
+        .from_select(['theatre_id', 'screen', 'showtime', 'seats_remaining'], seed)
+        .on_conflict_do_nothing(index_elements=['theatre_id', 'screen', 'showtime'])
+    )
+
+def open_showing(theatre_id, screen, showtime, seats):
+    db.session.execute(
+        insert(seat_inventory)
+        .values(theatre_id=theatre_id, screen=screen, showtime=showtime, seats_remaining=seats)
+        .on_conflict_do_nothing(index_elements=['theatre_id', 'screen', 'showtime'])
+    )
+
+def reserve_seats(theatre_id, screen, showtime, quantity):
+    if not isinstance(quantity, int) or quantity <= 0:
+        raise ValueError("Quantity must be greater than zero.")
+
+    ensure_showing(theatre_id, screen, showtime)
+    result = db.session.execute(
+        seat_inventory.update()
+        .where(
+            seat_inventory.c.theatre_id == theatre_id,
+            seat_inventory.c.screen == screen,
+            seat_inventory.c.showtime == showtime,
+            seat_inventory.c.seats_remaining >= quantity,
+        )
+        .values(seats_remaining=seat_inventory.c.seats_remaining - quantity)
+    )
+    return result.rowcount == 1
+
+def release_seats(theatre_id, screen, showtime, quantity, connection=None):
+    (connection or db.session).execute(
+        seat_inventory.update()
+        .where(
+            seat_inventory.c.theatre_id == theatre_id,
+            seat_inventory.c.screen == screen,
+            seat_inventory.c.showtime == showtime,
+        )
+        .values(seats_remaining=seat_inventory.c.seats_remaining + quantity)
+    )
+
+def resize_theatre(theatre_id, previous_capacity, capacity):
+    # Only showings sized by the theatre follow it: those whose seats equal
+    # the old capacity, and showtimes sold without a Showing. Shrinking below
+    # what one of them has already sold or held raises CapacityError.
+    delta = capacity - previous_capacity
+    if delta == 0:
+        return
+    follows_theatre = and_(
+        seat_inventory.c.theatre_id == theatre_id,
+        func.coalesce(
+            showing_seats(seat_inventory.c.theatre_id, seat_inventory.c.screen, seat_inventory.c.showtime),
+            previous_capacity,
+        ) == previous_capacity,
+    )
+    if delta < 0:
+        oversold = db.session.execute(
+            select(seat_inventory.c.id).where(follows_theatre, seat_inventory.c.seats_remaining + delta < 0).limit(1)
+        ).first()
+        if oversold is not None:
+            raise CapacityError("Capacity is below the seats already sold or held for a showing.")
+
+    db.session.execute(
+        seat_inventory.update()
+        .where(follows_theatre)
+        .values(seats_remaining=seat_inventory.c.seats_remaining + delta)
+    )
+    db.session.execute(
+        showings.update()
+        .where(showings.c.theatre_id == theatre_id, showings.c.seats == previous_capacity)
+        .values(seats=capacity)
+    )
+
+def rebuild_seat_inventory():
+    # Every showing gets a counter, sold or not, as does every showtime with
+    # tickets or holds but no Showing.
+    tickets = Ticket.__table__
+    holds = SeatHold.__table__
+    taken = union_all(
+        select(tickets.c.theatre_id, tickets.c.screen, tickets.c.showtime, tickets.c.quantity),
+        select(holds.c.theatre_id, holds.c.screen, holds.c.showtime, holds.c.quantity),
+    ).subquery()
+    sold = (
+        select(taken.c.theatre_id, taken.c.screen, taken.c.showtime, func.sum(taken.c.quantity).label('quantity'))
+        .group_by(taken.c.theatre_id, taken.c.screen, taken.c.showtime)
+        .subquery()
+    )
+    slots = union(
+        select(showings.c.theatre_id, showings.c.screen, showings.c.start_time.label('showtime')),
+        select(sold.c.theatre_id, sold.c.screen, sold.c.showtime),
+    ).subquery()
+
+    def same_slot(table, showtime):
+        return and_(table.c.theatre_id == slots.c.theatre_id, table.c.screen == slots.c.screen, showtime == slots.c.showtime)
+
+    remaining = (
+        select(
+            slots.c.theatre_id,
+            slots.c.screen,
+            slots.c.showtime,
+            func.coalesce(showings.c.seats, theaters.c.capacity) - func.coalesce(sold.c.quantity, 0),
+        )
+        .join(theaters, theaters.c.id == slots.c.theatre_id)
+        .outerjoin(showings, same_slot(showings, showings.c.start_time))
+        .outerjoin(sold, same_slot(sold, sold.c.showtime))
+    )
+    db.session.execute(seat_inventory.delete())
+    db.session.execute(
+        insert(seat_inventory).from_select(['theatre_id', 'screen', 'showtime', 'seats_remaining'], remaining)
+    )
+    db.session.commit()
+
+@app.cli.command('rebuild-seat-inventory')
+def rebuild_seat_inventory_command():
+    """Recompute remaining seats for every showing from its seats, sold tickets and active holds."""
+    rebuild_seat_inventory()
@@ -0,0 +1,159 @@
+import glob
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+
+from flask import request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Per-endpoint request instrumentation rendered in the Prometheus text format.
+# Each request only touches thread-local counters until after_request, where
+# one short locked update folds them into the endpoint's totals. In
+# MULTIPROCESS mode each worker also writes its totals to instance/metrics/
+# at most every DUMP_INTERVAL seconds as it finishes requests, and /metrics
+# adds up every worker's file, so a scrape that lands on any one worker
+# reports the whole server, give or take each worker's last few seconds.
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DUMP_INTERVAL = 5.0
+
+class EndpointStats:
+    __slots__ = ('buckets', 'count', 'seconds', 'statuses', 'response_bytes', 'queries', 'query_seconds')
+
+    def __init__(self):
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.seconds = 0.0
+        self.statuses = {}
+        self.response_bytes = 0
+        self.queries = 0
+        self.query_seconds = 0.0
+
+class RequestMetrics:
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.endpoints = {}
+        self.local = threading.local()
+        self.shared_dir = None
+        self.next_dump = 0.0
+
+    def init_app(self, app):
+        if app.config['MULTIPROCESS']:
+            self.shared_dir = os.path.join(app.instance_path, 'metrics')
+            os.makedirs(self.shared_dir, exist_ok=True)
+        app.before_request(self.start_request)
+        app.after_request(self.finish_request)
+        event.listen(Engine, 'before_cursor_execute', self.start_query)
+        event.listen(Engine, 'after_cursor_execute', self.finish_query)
+
+    def start_request(self):
+        local = self.local
+        local.active = True
+        local.queries = 0
+        local.query_seconds = 0.0
+        local.started = time.perf_counter()
+
+    def finish_request(self, response):
+        local = self.local
+        if not getattr(local, 'active', False):
+            return response
+        elapsed = time.perf_counter() - local.started
+        local.active = False
+
+        key = (request.endpoint or 'unmatched', request.method)
+        bucket = bisect_left(LATENCY_BUCKETS, elapsed)
+        # Streamed bodies have no length up front and are left out of the byte count.
+        size = response.content_length or 0
+        with self.lock:
+            stats = self.endpoints.get(key)
+            if stats is None:
+                stats = self.endpoints[key] = EndpointStats()
+            stats.buckets[bucket] += 1
+            stats.count += 1
+            stats.seconds += elapsed
+            stats.statuses[response.status_code] = stats.statuses.get(response.status_code, 0) + 1
+            stats.response_bytes += size
+            stats.queries += local.queries
+            stats.query_seconds += local.query_seconds
+        if self.shared_dir and time.monotonic() >= self.next_dump:
+            self.dump()
+        return response
+
+    def start_query(self, conn, cursor, statement, parameters, context, executemany):
+        self.local.query_started = time.perf_counter()
+
+    def finish_query(self, conn, cursor, statement, parameters, context, executemany):
+        local = self.local
+        if getattr(local, 'active', False):
+            local.queries += 1
+            local.query_seconds += time.perf_counter() - local.query_started
+
+    def snapshot(self):
+        with self.lock:
+            return [
+                (endpoint, method, list(stats.buckets), stats.count, stats.seconds, dict(stats.statuses), stats.response_bytes, stats.queries, stats.query_seconds)
+                for (endpoint, method), stats in sorted(self.endpoints.items())
+            ]
+
+    def dump(self):
+        self.next_dump = time.monotonic() + DUMP_INTERVAL
+        path = os.path.join(self.shared_dir, f'{os.getpid()}.json')
+        partial = f'{path}.{threading.get_ident()}.tmp'
+        with open(partial, 'w') as dump_file:
+            json.dump(self.snapshot(), dump_file)
+        os.replace(partial, path)
+
+    def shared_snapshot(self):
+        # Files of workers that have exited stay in the sum, so counters
+        # never go backwards while the server is up.
+        self.dump()
+        totals = {}
+        for path in glob.glob(os.path.join(self.shared_dir, '*.json')):
+            with open(path) as dump_file:
+                rows = json.load(dump_file)
+            for endpoint, method, buckets, count, seconds, statuses, response_bytes, query_count, query_seconds in rows:
+                total = totals.get((endpoint, method))
+                if total is None:
+                    total = totals[(endpoint, method)] = [[0] * len(buckets), 0, 0.0, {}, 0, 0, 0.0]
+                total[0] = [a + b for a, b in zip(total[0], buckets)]
+                total[1] += count
+                total[2] += seconds
+                for status, observed in statuses.items():
+                    total[3][int(status)] = total[3].get(int(status), 0) + observed
+                total[4] += response_bytes
+                total[5] += query_count
+                total[6] += query_seconds
+        return [(endpoint, method, *total) for (endpoint, method), total in sorted(totals.items())]
+
+    def render(self):
+        snapshot = self.shared_snapshot() if self.shared_dir else self.snapshot()
+
+        latency = ['# HELP http_request_duration_seconds Time spent handling requests.', '# TYPE http_request_duration_seconds histogram']
+        responses = ['# HELP http_responses_total Responses sent, by status code.', '# TYPE http_responses_total counter']
+        sizes = ['# HELP http_response_bytes_total Response body bytes sent (streamed bodies excluded).', '# TYPE http_response_bytes_total counter']
+        queries = ['# HELP http_request_sql_queries_total SQL statements executed while handling requests.', '# TYPE http_request_sql_queries_total counter']
+        query_time = ['# HELP http_request_sql_seconds_total Time spent in SQL statements while handling requests.', '# TYPE http_request_sql_seconds_total counter']
+
+        for endpoint, method, buckets, count, seconds, statuses, response_bytes, query_count, query_seconds in snapshot:
+            labels = f'endpoint="{endpoint}",method="{method}"'
+            cumulative = 0
+            for bound, observed in zip(LATENCY_BUCKETS, buckets):
+                cumulative += observed
+                latency.append(f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            latency.append(f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {count}')
+            latency.append(f'http_request_duration_seconds_sum{{{labels}}} {seconds}')
+            latency.append(f'http_request_duration_seconds_count{{{labels}}} {count}')
+            for status, observed in sorted(statuses.items()):
+                responses.append(f'http_responses_total{{{labels},status="{status}"}} {observed}')
+            sizes.append(f'http_response_bytes_total{{{labels}}} {response_bytes}')
+            queries.append(f'http_request_sql_queries_total{{{labels}}} {query_count}')
+            query_time.append(f'http_request_sql_seconds_total{{{labels}}} {query_seconds}')
+
+        return '\n'.join(latency + responses + sizes + queries + query_time) + '\n'
+
+request_metrics = RequestMetrics()
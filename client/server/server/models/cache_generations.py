@@ -0,0 +1,10 @@
+from config import db
+
+class CacheGeneration(db.Model):
+    __tablename__ = 'cache_generations'
+
+    key = db.Column(db.String, primary_key=True)
+    generation = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<CacheGeneration(key={self.key}, generation={self.generation})>"
@@ -0,0 +1,13 @@
+from config import db
+
+class IdempotencyKey(db.Model):
+    __tablename__ = 'idempotency_keys'
+
+    key = db.Column(db.String, primary_key=True)
+    fingerprint = db.Column(db.String, nullable=False)
+    status = db.Column(db.Integer)
+    response = db.Column(db.Text)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<IdempotencyKey(key={self.key}, status={self.status}, expires_at={self.expires_at})>"
@@ -1,21 +1,27 @@
-from sqlalchemy_serializer import SerializerMixin
 from sqlalchemy.orm import validates
-from datetime import datetime, date
+from datetime import date
 from urllib.parse import urlparse  # Import urlparse for URL parsing
 from sqlalchemy.ext.associationproxy import association_proxy
 
 from config import db
+from serializers import FastSerializerMixin, parse_date
 
-class Movie(db.Model, SerializerMixin):
+class Movie(db.Model, FastSerializerMixin):
     __tablename__ = 'movies'
+    __table_args__ = (
+        db.Index('ix_movies_tag_release_date', 'tag', 'release_date'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String, nullable=False)
     genre = db.Column(db.String)
     director = db.Column(db.String)
-    release_date = db.Column(db.String)
+    release_date = db.Column(db.Date, index=True)
     poster_image = db.Column(db.String)
     trailer_url = db.Column(db.String)
     tag = db.Column(db.String)
+    review_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    rating_sum = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    tickets_sold = db.Column(db.Integer, nullable=False, default=0, server_default='0')
 
     tickets = db.relationship('Ticket', backref='movie', lazy=True)
     reviews = db.relationship('Review', backref='movie', lazy=True)
@@ -24,24 +30,29 @@ class Movie(db.Model, SerializerMixin):
     review_comments = association_proxy('reviews', 'comment')
     tickets_quantity = association_proxy('tickets','quantity')
 
-    serialize_only = ('id', 'title', 'genre', 'director', 'release_date', 'poster_image', 'trailer_url', 'tag','review_ratings','review_comments','tickets_quantity',)
+    serialize_only = ('id', 'title', 'genre', 'director', 'release_date', 'poster_image', 'trailer_url', 'tag','review_count','rating_average','tickets_sold',)
 
     @validates('release_date')
     def validates_release_date(self, key, release_date):
         if release_date is not None:
             try:
-                datetime.strptime(release_date, '%Y-%m-%d')  
-            except ValueError:
+                release_date = parse_date(release_date)
+            except (TypeError, ValueError):
                 raise ValueError('Release date must be in the format YYYY-MM-DD')
         return release_date
 
+    @property
+    def rating_average(self):
+        if not self.review_count:
+            return 0
+        return round(self.rating_sum / self.review_count, 1)
+
     @property
     def calculate_tag(self):
-        release_date = datetime.strptime(self.release_date, '%Y-%m-%d').date()  # Adjusted format
         today = date.today()
-        if release_date > today:
+        if self.release_date > today:
             return 'upcoming'
-        elif release_date <= today:
+        elif self.release_date <= today:
             return 'in theatres'
 
     def __repr__(self):
@@ -1,8 +1,8 @@
-from sqlalchemy_serializer import SerializerMixin
 from sqlalchemy.orm import validates
 from config import db
+from serializers import FastSerializerMixin
 
-class Review(db.Model, SerializerMixin):
+class Review(db.Model, FastSerializerMixin):
     __tablename__ = 'reviews'
     
     id = db.Column(db.Integer, primary_key=True)
@@ -11,8 +11,8 @@ class Review(db.Model, SerializerMixin):
     submission_date = db.Column(db.DateTime, default=db.func.now())
       
     # Add relationships
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'))
-    movie_id = db.Column(db.Integer, db.ForeignKey('movies.id', ondelete='CASCADE'))
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), index=True)
+    movie_id = db.Column(db.Integer, db.ForeignKey('movies.id', ondelete='CASCADE'), index=True)
     
     # Add serialization
     serialize_only = ('id','rating','comment','submission_date','user_id','movie_id',)
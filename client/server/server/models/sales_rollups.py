@@ -0,0 +1,22 @@
+from config import db
+from serializers import FastSerializerMixin
+
+class SalesRollup(db.Model, FastSerializerMixin):
+    __tablename__ = 'sales_rollups'
+    __table_args__ = (
+        db.UniqueConstraint('movie_id', 'theatre_id', 'day'),
+        db.Index('ix_sales_rollups_theatre_id_day', 'theatre_id', 'day'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    movie_id = db.Column(db.Integer, db.ForeignKey('movies.id', ondelete='CASCADE'), nullable=False)
+    theatre_id = db.Column(db.Integer, db.ForeignKey('theaters.id', ondelete='CASCADE'), nullable=False)
+    day = db.Column(db.Date, nullable=False, index=True)
+    tickets = db.Column(db.Integer, nullable=False, default=0)
+    seats = db.Column(db.Integer, nullable=False, default=0)
+    revenue = db.Column(db.Float, nullable=False, default=0)
+
+    serialize_only = ('id','movie_id','theatre_id','day','tickets','seats','revenue',)
+
+    def __repr__(self):
+        return f"<SalesRollup(movie_id={self.movie_id}, theatre_id={self.theatre_id}, day={self.day}, seats={self.seats}, revenue={self.revenue})>"
@@ -0,0 +1,44 @@
+from sqlalchemy.orm import validates
+
+from config import db
+from serializers import SHOWTIME_FORMAT, FastSerializerMixin, parse_showtime
+
+class SeatHold(db.Model, FastSerializerMixin):
+    __tablename__ = 'seat_holds'
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), index=True)
+    movie_id = db.Column(db.Integer, db.ForeignKey('movies.id', ondelete='CASCADE'))
+    theatre_id = db.Column(db.Integer, db.ForeignKey('theaters.id', ondelete='CASCADE'), nullable=False)
+    screen = db.Column(db.Integer, nullable=False)
+    showtime = db.Column(db.DateTime, nullable=False)
+    quantity = db.Column(db.Integer, nullable=False)
+    price = db.Column(db.Float, nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+
+    # serialize_hold adds expires_at to the second; SHOWTIME_FORMAT would
+    # cut it to the minute.
+    serialize_only = ('id','user_id','movie_id','theatre_id','screen','showtime','quantity','price',)
+    datetime_format = SHOWTIME_FORMAT
+
+    @validates('quantity')
+    def validate_quantity(self, key, quantity):
+        if quantity <= 0:
+            raise ValueError("Quantity must be greater than zero.")
+        return quantity
+
+    @validates('price')
+    def validate_price(self, key, price):
+        if price <= 0:
+            raise ValueError("Price must be greater than zero.")
+        return price
+
+    @validates('showtime')
+    def validate_showtime(self, key, showtime):
+        try:
+            return parse_showtime(showtime)
+        except (TypeError, ValueError):
+            raise ValueError("Showtime must be in the format YYYY-MM-DD HH:MM")
+
+    def __repr__(self):
+        return f"<SeatHold(id={self.id}, theatre_id={self.theatre_id}, screen={self.screen}, showtime={self.showtime}, quantity={self.quantity}, expires_at={self.expires_at})>"
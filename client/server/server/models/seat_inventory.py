@@ -0,0 +1,20 @@
+from config import db
+from serializers import SHOWTIME_FORMAT, FastSerializerMixin
+
+class SeatInventory(db.Model, FastSerializerMixin):
+    __tablename__ = 'seat_inventory'
+    __table_args__ = (
+        db.UniqueConstraint('theatre_id', 'screen', 'showtime'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    theatre_id = db.Column(db.Integer, db.ForeignKey('theaters.id', ondelete='CASCADE'), nullable=False)
+    screen = db.Column(db.Integer, nullable=False)
+    showtime = db.Column(db.DateTime, nullable=False)
+    seats_remaining = db.Column(db.Integer, nullable=False)
+
+    serialize_only = ('id','theatre_id','screen','showtime','seats_remaining',)
+    datetime_format = SHOWTIME_FORMAT
+
+    def __repr__(self):
+        return f"<SeatInventory(theatre_id={self.theatre_id}, screen={self.screen}, showtime={self.showtime}, seats_remaining={self.seats_remaining})>"
@@ -0,0 +1,38 @@
+from sqlalchemy.orm import validates
+
+from config import db
+from serializers import SHOWTIME_FORMAT, FastSerializerMixin, parse_showtime
+
+class Showing(db.Model, FastSerializerMixin):
+    __tablename__ = 'showings'
+    __table_args__ = (
+        db.UniqueConstraint('theatre_id', 'screen', 'start_time'),
+        db.Index('ix_showings_movie_id_start_time', 'movie_id', 'start_time'),
+        db.Index('ix_showings_movie_id_theatre_id_start_time', 'movie_id', 'theatre_id', 'start_time'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    movie_id = db.Column(db.Integer, db.ForeignKey('movies.id', ondelete='CASCADE'), nullable=False)
+    theatre_id = db.Column(db.Integer, db.ForeignKey('theaters.id', ondelete='CASCADE'), nullable=False)
+    screen = db.Column(db.Integer, nullable=False)
+    start_time = db.Column(db.DateTime, nullable=False)
+    seats = db.Column(db.Integer, nullable=False)
+
+    serialize_only = ('id','movie_id','theatre_id','screen','start_time','seats',)
+    datetime_format = SHOWTIME_FORMAT
+
+    @validates('start_time')
+    def validate_start_time(self, key, start_time):
+        try:
+            return parse_showtime(start_time)
+        except (TypeError, ValueError):
+            raise ValueError('Start time must be in the format YYYY-MM-DD HH:MM')
+
+    @validates('seats')
+    def validate_seats(self, key, seats):
+        if not isinstance(seats, int) or seats <= 0:
+            raise ValueError("Seats must be a positive integer")
+        return seats
+
+    def __repr__(self):
+        return f"<Showing(id={self.id}, movie_id={self.movie_id}, theatre_id={self.theatre_id}, screen={self.screen}, start_time={self.start_time})>"
@@ -1,10 +1,10 @@
-from sqlalchemy_serializer import SerializerMixin
 from sqlalchemy.orm import validates
 from sqlalchemy.ext.associationproxy import association_proxy
 
 from config import db
+from serializers import SHOWTIME_FORMAT, FastSerializerMixin
 
-class Theatre(db.Model, SerializerMixin):
+class Theatre(db.Model, FastSerializerMixin):
    
     __tablename__ = 'theaters'
     
@@ -24,6 +24,7 @@ class Theatre(db.Model, SerializerMixin):
     
     # Serialization rules
     serialize_only = ('id','name','location','capacity','ticket_showtimes','ticket_screens')
+    datetime_format = SHOWTIME_FORMAT
     
     
     
@@ -1,26 +1,27 @@
-from sqlalchemy_serializer import SerializerMixin
 from sqlalchemy.orm import validates
 
 from config import db
+from serializers import SHOWTIME_FORMAT, FastSerializerMixin, parse_date, parse_showtime
 
 
-class Ticket(db.Model, SerializerMixin):
+class Ticket(db.Model, FastSerializerMixin):
     __tablename__ = 'tickets'
     
     id = db.Column(db.Integer, primary_key=True)
     quantity = db.Column(db.Integer, nullable=False)
     price = db.Column(db.Float, nullable=False)
-    purchase_date = db.Column(db.String, nullable=False)
-    showtime = db.Column(db.String, nullable=False)
+    purchase_date = db.Column(db.Date, nullable=False, index=True)
+    showtime = db.Column(db.DateTime, nullable=False, index=True)
     screen = db.Column(db.Integer, nullable=False)
 
     
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete= 'Cascade'))
-    movie_id = db.Column(db.Integer, db.ForeignKey('movies.id', ondelete= 'Cascade'))
-    theatre_id = db.Column(db.Integer, db.ForeignKey('theaters.id', ondelete= 'Cascade'))
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete= 'Cascade'), index=True)
+    movie_id = db.Column(db.Integer, db.ForeignKey('movies.id', ondelete= 'Cascade'), index=True)
+    theatre_id = db.Column(db.Integer, db.ForeignKey('theaters.id', ondelete= 'Cascade'), index=True)
 
     # Serialization rules
     serialize_only = ('id','quantity','price','purchase_date','showtime','screen','user_id','movie_id','theatre_id',)
+    datetime_format = SHOWTIME_FORMAT
      
     # Validation
     @validates('quantity')
@@ -34,6 +35,20 @@ class Ticket(db.Model, SerializerMixin):
         if price <= 0:
             raise ValueError("Price must be greater than zero.")
         return price
+
+    @validates('purchase_date')
+    def validate_purchase_date(self, key, purchase_date):
+        try:
+            return parse_date(purchase_date)
+        except (TypeError, ValueError):
+            raise ValueError("Purchase date must be in the format YYYY-MM-DD")
+
+    @validates('showtime')
+    def validate_showtime(self, key, showtime):
+        try:
+            return parse_showtime(showtime)
+        except (TypeError, ValueError):
+            raise ValueError("Showtime must be in the format YYYY-MM-DD HH:MM")
     
     def __repr__(self):
         return f"Ticket(ticket_id={self.ticket_id}, user_id={self.user_id}, movie_id={self.movie_id}, theatre_id={self.theatre_id}, quantity={self.quantity}, price={self.price}, purchase_date={self.purchase_date}, showtime={self.showtime})"
@@ -1,10 +1,10 @@
-from sqlalchemy_serializer import SerializerMixin
 from sqlalchemy.ext.hybrid import hybrid_property
-from sqlalchemy.orm import validates
-from config import db, bcrypt
+from config import db
+from hashing import password_hasher
+from serializers import SHOWTIME_FORMAT, FastSerializerMixin
 from sqlalchemy.ext.associationproxy import association_proxy
 
-class User(db.Model, SerializerMixin):
+class User(db.Model, FastSerializerMixin):
     __tablename__ = 'users'
 
     id = db.Column(db.Integer, primary_key=True)
@@ -24,20 +24,18 @@ class User(db.Model, SerializerMixin):
     ticket_screens = association_proxy('tickets', 'screen')
 
     serialize_only = ('id','username','email','review_ratings','review_comments','ticket_quantities','ticket_prices','ticket_purchase_dates','ticket_showtimes','ticket_screens',)
-
-    @validates('username')
-    def validate_username(self, key, username):
-        existing_user = User.query.filter(User.username == username).first()
-        if existing_user:
-            raise ValueError("Username already exists")
-        return username
-
-    @validates('email')
-    def validate_email(self, key, email):
-        existing_email = User.query.filter(User.email == email).first()
-        if existing_email:
-            raise ValueError("Email already exists")
-        return email
+    datetime_format = SHOWTIME_FORMAT
+
+    # Uniqueness of username and email is enforced by their unique indexes;
+    # the IntegrityError raised on flush is mapped back to a message here.
+    @staticmethod
+    def uniqueness_error(error):
+        message = str(error.orig)
+        if 'username' in message:
+            return "Username already exists"
+        if 'email' in message:
+            return "Email already exists"
+        return "User already exists"
 
     @hybrid_property
     def password_hash(self):
@@ -45,13 +43,16 @@ class User(db.Model, SerializerMixin):
 
     @password_hash.setter
     def password_hash(self, password):
-        password_hash = bcrypt.generate_password_hash(
-            password.encode('utf-8'))
-        self._password_hash = password_hash.decode('utf-8')
+        self._password_hash = password_hasher.hash(password)
 
     def authenticate(self, password):
-        return bcrypt.check_password_hash(
-            self._password_hash, password.encode('utf-8'))
+        if not password_hasher.verify(self._password_hash, password):
+            return False
+        # Upgrade hashes made with an older BCRYPT_LOG_ROUNDS while we
+        # still have the plaintext; the caller commits the change.
+        if password_hasher.needs_rehash(self._password_hash):
+            self._password_hash = password_hasher.rehash(password)
+        return True
 
     def __repr__(self):
         return f'User {self.username}, ID: {self.id}'
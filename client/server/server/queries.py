@@ -0,0 +1,37 @@
+from sqlalchemy import func
+from sqlalchemy.orm import joinedload
+
+from config import db
+from models.reviews import Review
+from models.seat_inventory import SeatInventory
+from models.showings import Showing
+from models.tickets import Ticket
+
+# The nested payloads of /reviews and /tickets read ticket.user, ticket.movie
+# and ticket.theatre. These are many-to-one, so joining them into the base
+# SELECT keeps every list and detail request at a single query.
+
+def reviews_query():
+    return Review.query.options(
+        joinedload(Review.user),
+        joinedload(Review.movie),
+    )
+
+def tickets_query():
+    return Ticket.query.options(
+        joinedload(Ticket.user),
+        joinedload(Ticket.movie),
+        joinedload(Ticket.theatre),
+    )
+
+def showings_query():
+    # Each showing paired with its live seat counter.
+    return db.session.query(
+        Showing,
+        func.coalesce(SeatInventory.seats_remaining, Showing.seats),
+    ).outerjoin(
+        SeatInventory,
+        (SeatInventory.theatre_id == Showing.theatre_id)
+        & (SeatInventory.screen == Showing.screen)
+        & (SeatInventory.showtime == Showing.start_time),
+    )
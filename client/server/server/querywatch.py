@@ -0,0 +1,104 @@
+import os
+import re
+import threading
+import time
+import traceback
+from functools import wraps
+
+from flask import current_app, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Debug/staging detector for N+1 loading and slow requests. While a request
+# is active every statement is grouped by shape (whitespace and expanded IN
+# lists collapsed); a shape run more than QUERY_WATCH_REPEAT times, or a
+# request spending more than QUERY_WATCH_BUDGET_MS in SQL, is logged with the
+# statement and the application line that issued it. With QUERY_WATCH_STRICT
+# the request raises QueryWatchViolation instead, which the test client
+# propagates.
+
+SOURCE_DIR = os.path.dirname(os.path.abspath(__file__))
+IN_LIST = re.compile(r'\(\s*\?(?:\s*,\s*\?)+\s*\)')
+WHITESPACE = re.compile(r'\s+')
+
+class QueryWatchViolation(Exception):
+    pass
+
+def statement_shape(statement):
+    return IN_LIST.sub('(?)', WHITESPACE.sub(' ', statement).strip())
+
+def call_site():
+    for frame in reversed(traceback.extract_stack()[:-1]):
+        if frame.filename.startswith(SOURCE_DIR) and not frame.filename.endswith('querywatch.py'):
+            return f'{os.path.relpath(frame.filename, SOURCE_DIR)}:{frame.lineno} in {frame.name}'
+    return 'unknown'
+
+class QueryWatch:
+
+    def __init__(self):
+        self.local = threading.local()
+
+    def init_app(self, app):
+        if not app.config.get('QUERY_WATCH'):
+            return
+        app.before_request(self.start_request)
+        app.after_request(self.finish_request)
+        event.listen(Engine, 'before_cursor_execute', self.start_query)
+        event.listen(Engine, 'after_cursor_execute', self.finish_query)
+
+    def allow_repeats(self, view):
+        # For handlers whose repeated statement is deliberate and bounded,
+        # e.g. one guarded UPDATE per purchase in a size-capped batch.
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            self.local.allow_repeats = True
+            return view(*args, **kwargs)
+        return wrapper
+
+    def start_request(self):
+        local = self.local
+        local.active = True
+        local.allow_repeats = False
+        local.shapes = {}
+        local.sql_seconds = 0.0
+
+    def start_query(self, conn, cursor, statement, parameters, context, executemany):
+        self.local.query_started = time.perf_counter()
+
+    def finish_query(self, conn, cursor, statement, parameters, context, executemany):
+        local = self.local
+        if not getattr(local, 'active', False):
+            return
+        local.sql_seconds += time.perf_counter() - local.query_started
+        shape = statement_shape(statement)
+        seen = local.shapes.get(shape)
+        if seen is None:
+            local.shapes[shape] = [1, call_site()]
+        else:
+            seen[0] += 1
+
+    def finish_request(self, response):
+        local = self.local
+        if not getattr(local, 'active', False):
+            return response
+        local.active = False
+
+        config = current_app.config
+        problems = []
+        if not local.allow_repeats:
+            for shape, (count, site) in local.shapes.items():
+                if count > config['QUERY_WATCH_REPEAT']:
+                    problems.append(f'statement ran {count} times (limit {config["QUERY_WATCH_REPEAT"]}) from {site}: {shape}')
+        budget = config['QUERY_WATCH_BUDGET_MS'] / 1000
+        if local.sql_seconds > budget:
+            busiest = max(local.shapes.items(), key=lambda item: item[1][0])
+            problems.append(f'{local.sql_seconds * 1000:.1f} ms in SQL (budget {budget * 1000:.0f} ms); most repeated from {busiest[1][1]}: {busiest[0]}')
+
+        if problems:
+            message = f'{request.method} {request.full_path.rstrip("?")}: ' + '; '.join(problems)
+            if config['QUERY_WATCH_STRICT']:
+                raise QueryWatchViolation(message)
+            current_app.logger.warning(message)
+        return response
+
+query_watch = QueryWatch()
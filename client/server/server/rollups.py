@@ -0,0 +1,150 @@
+from sqlalchemy import event, func, select
+from sqlalchemy.dialects.sqlite import insert
+
+from aggregates import previous_value
+from config import app, db
+from models.movies import Movie
+from models.sales_rollups import SalesRollup
+from models.theaters import Theatre
+from models.tickets import Ticket
+from serializers import format_date
+
+# Ticket sales summed per (movie, theatre, purchase day). Like the movie
+# stats in aggregates.py, the rollup rows are adjusted by listeners inside
+# the flush that writes the ticket, so they commit or roll back with it, and
+# the analytics endpoints read a few rows per day instead of scanning tickets.
+# Tickets removed by a database-level cascade (e.g. deleting a user) bypass
+# the listeners; `flask rebuild-sales-rollups` recomputes everything.
+
+sales = SalesRollup.__table__
+tickets = Ticket.__table__
+movies = Movie.__table__
+theaters = Theatre.__table__
+
+SALES_KEY = ('movie_id', 'theatre_id', 'day')
+
+def adjust_sales(connection, movie_id, theatre_id, day, tickets=0, seats=0, revenue=0):
+    if movie_id is None or theatre_id is None:
+        return
+    upsert = insert(sales).values(movie_id=movie_id, theatre_id=theatre_id, day=day, tickets=tickets, seats=seats, revenue=revenue)
+    connection.execute(
+        upsert.on_conflict_do_update(
+            index_elements=list(SALES_KEY),
+            set_={
+                'tickets': sales.c.tickets + upsert.excluded.tickets,
+                'seats': sales.c.seats + upsert.excluded.seats,
+                'revenue': sales.c.revenue + upsert.excluded.revenue,
+            },
+        )
+    )
+
+def ticket_sale(values, sign=1):
+    movie_id, theatre_id, day, price, quantity = values
+    return dict(movie_id=movie_id, theatre_id=theatre_id, day=day, tickets=sign, seats=sign * quantity, revenue=sign * price * quantity)
+
+def current_sale(target):
+    return (target.movie_id, target.theatre_id, target.purchase_date, target.price, target.quantity)
+
+def previous_sale(target):
+    return tuple(previous_value(target, key) for key in ('movie_id', 'theatre_id', 'purchase_date', 'price', 'quantity'))
+
+@event.listens_for(Ticket, 'after_insert')
+def ticket_inserted(mapper, connection, target):
+    adjust_sales(connection, **ticket_sale(current_sale(target)))
+
+@event.listens_for(Ticket, 'after_update')
+def ticket_updated(mapper, connection, target):
+    old, new = previous_sale(target), current_sale(target)
+    if old == new:
+        return
+    adjust_sales(connection, **ticket_sale(old, sign=-1))
+    adjust_sales(connection, **ticket_sale(new))
+
+@event.listens_for(Ticket, 'after_delete')
+def ticket_deleted(mapper, connection, target):
+    adjust_sales(connection, **ticket_sale(previous_sale(target), sign=-1))
+
+def sales_bulk_inserted(connection, rows):
+    # Bulk INSERTs skip the mapper events, so callers report them here.
+    totals = {}
+    for row in rows:
+        key = tuple(row[column] for column in ('movie_id', 'theatre_id', 'purchase_date'))
+        total = totals.setdefault(key, [0, 0, 0])
+        total[0] += 1
+        total[1] += row['quantity']
+        total[2] += row['price'] * row['quantity']
+    for (movie_id, theatre_id, day), (count, seats, revenue) in totals.items():
+        adjust_sales(connection, movie_id, theatre_id, day, tickets=count, seats=seats, revenue=revenue)
+
+def rebuild_sales_rollups():
+    sold = (
+        select(
+            tickets.c.movie_id,
+            tickets.c.theatre_id,
+            tickets.c.purchase_date,
+            func.count(),
+            func.sum(tickets.c.quantity),
+            func.sum(tickets.c.price * tickets.c.quantity),
+        )
+        .where(tickets.c.movie_id.is_not(None), tickets.c.theatre_id.is_not(None))
+        .group_by(tickets.c.movie_id, tickets.c.theatre_id, tickets.c.purchase_date)
+    )
+    db.session.execute(sales.delete())
+    db.session.execute(
+        insert(sales).from_select([*SALES_KEY, 'tickets', 'seats', 'revenue'], sold)
+    )
+    db.session.commit()
+
+def sales_totals(group_by=(), start=None, end=None, movie_id=None, theatre_id=None):
+    query = select(
+        *group_by,
+        func.coalesce(func.sum(sales.c.tickets), 0).label('tickets'),
+        func.coalesce(func.sum(sales.c.seats), 0).label('seats'),
+        func.coalesce(func.sum(sales.c.revenue), 0).label('revenue'),
+    ).select_from(sales)
+    if start is not None:
+        query = query.where(sales.c.day >= start)
+    if end is not None:
+        query = query.where(sales.c.day <= end)
+    if movie_id is not None:
+        query = query.where(sales.c.movie_id == movie_id)
+    if theatre_id is not None:
+        query = query.where(sales.c.theatre_id == theatre_id)
+    if group_by:
+        query = query.group_by(*group_by).having(func.sum(sales.c.tickets) > 0)
+    return query
+
+def sales_row(row, **fields):
+    return {**fields, "tickets": row.tickets, "seats": row.seats, "revenue": round(row.revenue, 2)}
+
+def sales_summary(**filters):
+    return sales_row(db.session.execute(sales_totals(**filters)).one())
+
+def daily_sales(**filters):
+    rows = db.session.execute(sales_totals((sales.c.day,), **filters).order_by(sales.c.day))
+    return [sales_row(row, day=format_date(row.day)) for row in rows]
+
+def sales_by_movie(limit, **filters):
+    totals = sales_totals((sales.c.movie_id,), **filters).subquery()
+    rows = db.session.execute(
+        select(totals, movies.c.title)
+        .join(movies, movies.c.id == totals.c.movie_id)
+        .order_by(totals.c.revenue.desc(), totals.c.movie_id)
+        .limit(limit)
+    )
+    return [sales_row(row, movie_id=row.movie_id, title=row.title) for row in rows]
+
+def sales_by_theatre(limit, **filters):
+    totals = sales_totals((sales.c.theatre_id,), **filters).subquery()
+    rows = db.session.execute(
+        select(totals, theaters.c.name, theaters.c.location)
+        .join(theaters, theaters.c.id == totals.c.theatre_id)
+        .order_by(totals.c.revenue.desc(), totals.c.theatre_id)
+        .limit(limit)
+    )
+    return [sales_row(row, theatre_id=row.theatre_id, name=row.name, location=row.location) for row in rows]
+
+@app.cli.command('rebuild-sales-rollups')
+def rebuild_sales_rollups_command():
+    """Recompute the per-movie, per-theatre daily sales rollups from tickets."""
+    rebuild_sales_rollups()
@@ -0,0 +1,87 @@
+import re
+
+from sqlalchemy import DDL, event, text
+
+from config import app, db
+from models.movies import Movie
+from models.reviews import Review
+
+# SQLite FTS5 indexes over movie titles/directors/genres and review comments.
+# They are external-content tables: the text lives only in movies/reviews and
+# triggers on those tables keep the index in step with every insert, update
+# and delete, whether it comes from the ORM, a Core bulk insert or raw SQL.
+# The update triggers only fire for the indexed columns, so the stats counters
+# bumped on every booking never touch the index.
+
+SEARCH_INDEXES = {
+    'movies_fts': (Movie.__table__, ('title', 'director', 'genre')),
+    'reviews_fts': (Review.__table__, ('comment',)),
+}
+TOKENIZE = 'porter unicode61 remove_diacritics 2'
+TERM = re.compile(r'\w+')
+MIN_PREFIX = 2
+RANK_WINDOW = 2000
+
+def search_index_ddl(index, table, columns):
+    names = ', '.join(columns)
+    new_values = ', '.join(f'new.{column}' for column in columns)
+    old_values = ', '.join(f'old.{column}' for column in columns)
+    insert_new = f"INSERT INTO {index}(rowid, {names}) VALUES (new.id, {new_values});"
+    delete_old = f"INSERT INTO {index}({index}, rowid, {names}) VALUES ('delete', old.id, {old_values});"
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {index} USING fts5({names}, content='{table.name}', content_rowid='id', tokenize='{TOKENIZE}', prefix='2 3')",
+        f"CREATE TRIGGER IF NOT EXISTS {index}_insert AFTER INSERT ON {table.name} BEGIN {insert_new} END",
+        f"CREATE TRIGGER IF NOT EXISTS {index}_delete AFTER DELETE ON {table.name} BEGIN {delete_old} END",
+        f"CREATE TRIGGER IF NOT EXISTS {index}_update AFTER UPDATE OF {names} ON {table.name} BEGIN {delete_old} {insert_new} END",
+    ]
+
+for index, (table, columns) in SEARCH_INDEXES.items():
+    for statement in search_index_ddl(index, table, columns):
+        event.listen(table, 'after_create', DDL(statement).execute_if(dialect='sqlite'))
+    event.listen(table, 'before_drop', DDL(f'DROP TABLE IF EXISTS {index}').execute_if(dialect='sqlite'))
+
+def match_expression(query):
+    # User input never reaches FTS5 syntax: every word is quoted, and the
+    # last one matches as a prefix so results follow what is being typed.
+    # Single letters stay exact, as only 2- and 3-letter prefixes are indexed.
+    words = TERM.findall(query.lower())
+    if not words:
+        return None
+    terms = [f'"{word}"' for word in words]
+    if len(words[-1]) >= MIN_PREFIX:
+        terms[-1] += '*'
+    return ' '.join(terms)
+
+def ranked_ids(index, match, limit, offset):
+    # bm25 is computed for every row it orders, so a common word across a
+    # million reviews would cost hundreds of milliseconds. Only the newest
+    # RANK_WINDOW matches are ranked: FTS5 walks its doclist by rowid and
+    # stops there, and rarer queries still rank every match. Every page
+    # ranks that same window (ties broken by rowid), so paging through it
+    # never repeats or skips a result; the results end where it does.
+    rows = db.session.execute(
+        text(
+            f'SELECT rowid FROM (SELECT rowid, rank FROM {index} WHERE {index} MATCH :match ORDER BY rowid DESC LIMIT :window) '
+            'ORDER BY rank, rowid DESC LIMIT :limit OFFSET :offset'
+        ),
+        {"match": match, "window": RANK_WINDOW, "limit": limit + 1, "offset": offset},
+    ).scalars().all()
+    next_offset = offset + limit if len(rows) > limit else None
+    return rows[:limit], next_offset
+
+def in_rank_order(ids, rows):
+    by_id = {row.id: row for row in rows}
+    return [by_id[id] for id in ids if id in by_id]
+
+def rebuild_search_index():
+    with db.engine.begin() as connection:
+        for index, (table, columns) in SEARCH_INDEXES.items():
+            for statement in search_index_ddl(index, table, columns):
+                connection.exec_driver_sql(statement)
+            connection.exec_driver_sql(f"INSERT INTO {index}({index}) VALUES ('rebuild')")
+            connection.exec_driver_sql(f"INSERT INTO {index}({index}) VALUES ('optimize')")
+
+@app.cli.command('rebuild-search-index')
+def rebuild_search_index_command():
+    """Create the full-text indexes if missing and rebuild them from movies and reviews."""
+    rebuild_search_index()
@@ -1,12 +1,16 @@
 #!/usr/bin/env python3
 
 # Standard library imports
+import argparse
+import random
 from random import randint, choice as rc
 from random import uniform
-from datetime import datetime, timedelta
+from datetime import datetime, time, timedelta
+from itertools import islice
 
 # Remote library imports
 from faker import Faker
+from sqlalchemy import insert, select
 
 from config import db
 
@@ -17,6 +21,16 @@ from models.tickets import Ticket
 from models.users import User
 from models.reviews import Review
 from models.theaters import Theatre
+from models.showings import Showing
+from models.seat_holds import SeatHold
+from models.seat_inventory import SeatInventory
+from models.sales_rollups import SalesRollup
+from aggregates import rebuild_movie_stats
+from hashing import password_hasher
+from inventory import open_showing, rebuild_seat_inventory
+from rollups import rebuild_sales_rollups
+
+fake = Faker()
 
 def seed_movies(num_movies=20):
     genre_list = ["Action", "Comedy", "Drama", "Thriller", "Horror", "Romance", "Sci-Fi", "Crime", "Adventure", "Narrative", "Fantasy", "Documentary", "Musical", "Anime", "Mystery", "Slapstick", "Art", "Hindi", "Korean", "History"]
@@ -28,7 +42,7 @@ def seed_movies(num_movies=20):
             title=fake.catch_phrase(),
             genre=rc(genre_list),
             director=fake.name(),
-            release_date=fake.date_between(start_date=start_date, end_date=end_date).strftime('%Y-%m-%d'),
+            release_date=fake.date_between(start_date=start_date, end_date=end_date),
             poster_image=fake.image_url()
         )
         movies.append(movie)
@@ -51,7 +65,31 @@ def seed_theatres(num_theatres=10):
         db.session.add(theatre)
     db.session.commit()
     print (theatres)
+    return theatres
+
 
+def seed_showings(days=14, showtimes=("11:00", "13:00", "15:00", "17:00")):
+    movies = Movie.query.all()
+    theatres = Theatre.query.all()
+    showings = []
+    if not movies:
+        return showings
+    for day in range(days):
+        show_date = (datetime.now() + timedelta(days=day)).strftime('%Y-%m-%d')
+        for theatre in theatres:
+            for screen, start in enumerate(showtimes, start=1):
+                showing = Showing(
+                    movie_id=rc(movies).id,
+                    theatre_id=theatre.id,
+                    screen=screen,
+                    start_time=f"{show_date} {start}",
+                    seats=theatre.capacity,
+                )
+                showings.append(showing)
+                db.session.add(showing)
+                open_showing(theatre.id, screen, showing.start_time, showing.seats)
+    db.session.commit()
+    return showings
 
 def seed_users(num_users=50):
     users = []
@@ -105,24 +143,167 @@ def seed_reviews(num_reviews=30):
     db.session.commit()
     return reviews
 
+# Bulk mode for load-test datasets. Rows are generated lazily from a seeded
+# RNG and written with multi-row INSERTs, committing every batch_size rows,
+# so memory stays bounded at millions of tickets. Tickets are drawn against
+# the showings' remaining seats, which then become the seat inventory.
+
+SHOWTIMES = (time(11), time(13), time(15), time(17), time(19), time(21))
+SCREENS = 5
+
+def batched(rows, size):
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+def bulk_insert(model, rows, batch_size):
+    count = 0
+    for batch in batched(rows, batch_size):
+        db.session.execute(insert(model.__table__), batch)
+        db.session.commit()
+        count += len(batch)
+    return count
+
+def user_rows(num_users, password, precomputed_hash, batch_size):
+    shared_hash = password_hasher.hash(password) if precomputed_hash else None
+    for start in range(0, num_users, batch_size):
+        ids = range(start, min(start + batch_size, num_users))
+        hashes = [shared_hash] * len(ids) if shared_hash else password_hasher.hash_many([password] * len(ids))
+        for i, password_hash in zip(ids, hashes):
+            yield {"username": f"user{i}", "email": f"user{i}@example.com", "_password_hash": password_hash}
+
+def showing_rows(rng, num_showings, movie_ids, theatres, first_day):
+    count = 0
+    day = 0
+    while True:
+        show_date = (first_day + timedelta(days=day)).date()
+        for theatre in theatres:
+            for screen in range(1, SCREENS + 1):
+                for start in SHOWTIMES:
+                    if count == num_showings:
+                        return
+                    count += 1
+                    yield {
+                        "movie_id": rng.choice(movie_ids),
+                        "theatre_id": theatre.id,
+                        "screen": screen,
+                        "start_time": datetime.combine(show_date, start),
+                        "seats": theatre.capacity,
+                    }
+        day += 1
+
+def ticket_rows(rng, num_tickets, showings, remaining, user_ids):
+    for _ in range(num_tickets):
+        quantity = rng.randint(1, 5)
+        index = rng.randrange(len(showings))
+        for _ in range(len(showings)):
+            if remaining[index] >= quantity:
+                break
+            index = (index + 1) % len(showings)
+        else:
+            return
+        remaining[index] -= quantity
+        showing = showings[index]
+        yield {
+            "user_id": rng.choice(user_ids),
+            "movie_id": showing["movie_id"],
+            "theatre_id": showing["theatre_id"],
+            "screen": showing["screen"],
+            "showtime": showing["start_time"],
+            "quantity": quantity,
+            "price": rng.randint(100, 500),
+            "purchase_date": (showing["start_time"] - timedelta(days=rng.randint(0, 14))).date(),
+        }
+
+def review_rows(rng, num_reviews, movie_ids, user_ids, first_day):
+    comments = [fake.paragraph() for _ in range(1000)]
+    for _ in range(num_reviews):
+        yield {
+            "user_id": rng.choice(user_ids),
+            "movie_id": rng.choice(movie_ids),
+            "rating": rng.randint(1, 5),
+            "comment": rng.choice(comments),
+            "submission_date": first_day + timedelta(minutes=rng.randint(0, 60 * 24 * 90)),
+        }
+
+def seed_scaled(scale, seed=42, batch_size=10000, password='password', precomputed_hash=False):
+    rng = random.Random(seed)
+    random.seed(seed)
+    fake.seed_instance(seed)
+    first_day = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=30)
+
+    print("seeding movies...")
+    movie_ids = [movie.id for movie in seed_movies(max(20, scale // 5000))]
+
+    print("seeding theatres...")
+    theatres = seed_theatres(max(10, scale // 50000))
+
+    print("seeding users...")
+    bulk_insert(User, user_rows(max(50, scale // 20), password, precomputed_hash, batch_size), batch_size)
+    user_ids = db.session.scalars(select(User.id)).all()
+
+    print("seeding showings...")
+    showings = list(showing_rows(rng, max(100, scale // 15), movie_ids, theatres, first_day))
+    bulk_insert(Showing, showings, batch_size)
+
+    print("seeding tickets...")
+    remaining = [showing["seats"] for showing in showings]
+    tickets = bulk_insert(Ticket, ticket_rows(rng, scale, showings, remaining, user_ids), batch_size)
+
+    print("seeding reviews...")
+    reviews = bulk_insert(Review, review_rows(rng, scale // 2, movie_ids, user_ids, first_day), batch_size)
+
+    print("building seat inventory, movie stats and sales rollups...")
+    bulk_insert(SeatInventory, (
+        {"theatre_id": showing["theatre_id"], "screen": showing["screen"], "showtime": showing["start_time"], "seats_remaining": seats}
+        for showing, seats in zip(showings, remaining)
+    ), batch_size)
+    rebuild_movie_stats()
+    rebuild_sales_rollups()
+
+    print(f"Seeded {len(user_ids)} users, {len(showings)} showings, {tickets} tickets and {reviews} reviews.")
+
+def clear_db():
+    for model in (SalesRollup, SeatHold, Ticket, Review, SeatInventory, Showing, User, Theatre, Movie):
+        model.query.delete()
+    db.session.commit()
+
 if __name__ == '__main__':
-    fake = Faker()
+    parser = argparse.ArgumentParser(description='Seed the database.')
+    parser.add_argument('--scale', type=int, help='bulk mode: number of tickets to generate (e.g. 1000000)')
+    parser.add_argument('--seed', type=int, default=42, help='RNG seed, so the same arguments give the same rows')
+    parser.add_argument('--batch-size', type=int, default=10000, help='rows per INSERT batch and commit in bulk mode')
+    parser.add_argument('--password', default='password', help='password given to every bulk-seeded user')
+    parser.add_argument('--precomputed-hash', action='store_true', help='hash --password once and reuse it for every bulk-seeded user')
+    args = parser.parse_args()
+
     with app.app_context():
 
         print("Clearing db...")
-        Theatre.query.delete()
-        Ticket.query.delete()
-        User.query.delete()
-        Review.query.delete()
+        clear_db()
 
         print("Starting seed...")
 
-        # print("seeding movies...")
-        # movies = seed_movies()
+        if args.scale:
+            seed_scaled(args.scale, seed=args.seed, batch_size=args.batch_size, password=args.password, precomputed_hash=args.precomputed_hash)
+            print("Seed completed successfully!")
+            raise SystemExit(0)
+
+        random.seed(args.seed)
+        fake.seed_instance(args.seed)
+
+        print("seeding movies...")
+        movies = seed_movies()
 
         print("seeding theatres...")
         theatres = seed_theatres()
 
+        print("seeding showings...")
+        showings = seed_showings()
+
         print("seeding users...")
         users = seed_users()
 
@@ -132,4 +313,6 @@ if __name__ == '__main__':
         print("seeding reviews...")
         reviews = seed_reviews()
 
+        rebuild_seat_inventory()
+
         print("Seed completed successfully!")
@@ -0,0 +1,138 @@
+import operator
+from collections.abc import Iterable
+from datetime import date, datetime
+
+from sqlalchemy import event
+from sqlalchemy_serializer import SerializerMixin
+
+class FastSerializerMixin(SerializerMixin):
+    # Drop-in for SerializerMixin. A bare to_dict() runs an extractor that is
+    # compiled once per model from serialize_only when the model is mapped,
+    # instead of walking the rules by reflection on every call. Any argument
+    # (only=, rules=, formats...) falls back to the reflective serializer.
+
+    def to_dict(self, *args, **kwargs):
+        if args or kwargs:
+            return super().to_dict(*args, **kwargs)
+        return self._extract(self)
+
+@event.listens_for(FastSerializerMixin, 'instrument_class', propagate=True)
+def compile_extractor(mapper, cls):
+    fields = tuple(cls.serialize_only)
+    getter = operator.attrgetter(*fields)
+    converters = [
+        (field, converter)
+        for field, converter in ((field, value_converter(cls, field)) for field in fields)
+        if converter is not None
+    ]
+
+    def extract(obj):
+        values = getter(obj)
+        data = dict(zip(fields, values if len(fields) > 1 else (values,)))
+        for field, converter in converters:
+            if data[field] is not None:
+                data[field] = converter(data[field])
+        return data
+
+    cls._extract = staticmethod(extract)
+
+def value_converter(cls, field):
+    column = cls.__table__.columns.get(field)
+    if column is None:
+        # Properties and association proxies: shape unknown until read.
+        return lambda value: serialize_value(cls, value)
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return lambda value: serialize_value(cls, value)
+    if issubclass(python_type, datetime):
+        return lambda value: value.strftime(cls.datetime_format)
+    if issubclass(python_type, date):
+        return lambda value: value.strftime(cls.date_format)
+    return None
+
+def serialize_value(cls, value):
+    if isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, datetime):
+        return value.strftime(cls.datetime_format)
+    if isinstance(value, date):
+        return value.strftime(cls.date_format)
+    if isinstance(value, Iterable):
+        return [serialize_value(cls, item) for item in value]
+    return value
+
+# Dates travel as 'YYYY-MM-DD' and showtimes as 'YYYY-MM-DD HH:MM' strings
+# in the API, and as Date/DateTime columns in the database.
+
+DATE_FORMAT = '%Y-%m-%d'
+SHOWTIME_FORMAT = '%Y-%m-%d %H:%M'
+EXPIRY_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+def parse_date(value):
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(value, DATE_FORMAT).date()
+
+def parse_showtime(value):
+    if isinstance(value, datetime):
+        return value
+    return datetime.strptime(value, SHOWTIME_FORMAT)
+
+def format_date(value):
+    return value.strftime(DATE_FORMAT) if value is not None else None
+
+def format_showtime(value):
+    return value.strftime(SHOWTIME_FORMAT) if value is not None else None
+
+# Nested payloads shared by the review and ticket resources.
+
+def serialize_user_summary(user):
+    return {
+        "id": user.id,
+        "name": user.username,
+    }
+
+def serialize_movie_summary(movie):
+    return {
+        "id": movie.id,
+        "title": movie.title,
+        "genre": movie.genre,
+        "director": movie.director,
+        "release_date": format_date(movie.release_date)
+    }
+
+def serialize_theatre_summary(theatre):
+    return {
+        "id": theatre.id,
+        "name": theatre.name,
+        "location": theatre.location,
+        "capacity": theatre.capacity,
+    }
+
+def serialize_review(review):
+    return {
+        "id": review.id,
+        "comment": review.comment,
+        "rating": review.rating,
+        "user": serialize_user_summary(review.user),
+        "movie": serialize_movie_summary(review.movie)
+    }
+
+def serialize_ticket(ticket):
+    return {
+        "id": ticket.id,
+        "price": ticket.price,
+        "purchase_date": format_date(ticket.purchase_date),
+        "screen": ticket.screen,
+        "quantity": ticket.quantity,
+        "showtime": format_showtime(ticket.showtime),
+        "user": serialize_user_summary(ticket.user),
+        "movie": serialize_movie_summary(ticket.movie),
+        "theatre": serialize_theatre_summary(ticket.theatre)
+    }
+
+def serialize_hold(hold):
+    return {**hold.to_dict(), "expires_at": hold.expires_at.strftime(EXPIRY_FORMAT)}
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+
+# Standard library imports
+import argparse
+import os
+import shutil
+
+# Production launcher: gunicorn with one pre-forked worker process per core,
+# each running a few request threads. `python app.py` stays the single
+# process development server.
+
+INSTANCE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'instance')
+
+def cpu_count():
+    return len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else os.cpu_count() or 1
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Serve the API with multiple worker processes.')
+    parser.add_argument('--bind', default=os.environ.get('BIND', '127.0.0.1:5555'), help='address to listen on')
+    parser.add_argument('--workers', type=int, default=int(os.environ.get('WEB_CONCURRENCY', cpu_count())), help='worker processes (default: one per core)')
+    parser.add_argument('--threads', type=int, default=int(os.environ.get('WEB_THREADS', 4)), help='request threads per worker')
+    parser.add_argument('--timeout', type=int, default=30, help='seconds before a silent worker is restarted')
+    args = parser.parse_args()
+
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        raise SystemExit('serve.py needs gunicorn: pip install gunicorn')
+
+    # Settings read by config.py in each worker. Workers share the cores,
+    # so each gets its share of the bcrypt pool.
+    os.environ.setdefault('MULTIPROCESS', '1' if args.workers > 1 else '0')
+    os.environ.setdefault('BCRYPT_WORKERS', str(max(1, cpu_count() // args.workers)))
+    # Dumps left by a previous run's workers would be added to this one's.
+    shutil.rmtree(os.path.join(INSTANCE_PATH, 'metrics'), ignore_errors=True)
+
+    class Server(BaseApplication):
+
+        def load_config(self):
+            self.cfg.set('bind', args.bind)
+            self.cfg.set('workers', args.workers)
+            self.cfg.set('threads', args.threads)
+            self.cfg.set('worker_class', 'gthread')
+            self.cfg.set('timeout', args.timeout)
+            # The app is imported in each worker after the fork, so no
+            # database connection or bcrypt thread is shared between them.
+            self.cfg.set('preload_app', False)
+
+        def load(self):
+            from app import app
+            return app
+
+    print(f"Serving on {args.bind} with {args.workers} workers x {args.threads} threads.")
+    Server().run()
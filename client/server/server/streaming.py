@@ -0,0 +1,40 @@
+from flask import Response, current_app, request, stream_with_context
+
+NDJSON = 'application/x-ndjson'
+STREAM_BATCH_SIZE = 1000
+
+# Full-table exports are written out while the query is still being read:
+# rows arrive STREAM_BATCH_SIZE at a time via yield_per and each batch is
+# encoded and flushed before the next is fetched, so memory stays flat.
+
+def wants_stream():
+    return request.args.get('stream') == '1' or request.accept_mimetypes.best == NDJSON
+
+def stream_collection(query, serialize):
+    ndjson = request.accept_mimetypes.best == NDJSON
+    dumps = current_app.json.dumps
+
+    def batches():
+        batch = []
+        for row in query.yield_per(STREAM_BATCH_SIZE):
+            batch.append(dumps(serialize(row)))
+            if len(batch) == STREAM_BATCH_SIZE:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def generate():
+        if ndjson:
+            for batch in batches():
+                yield '\n'.join(batch) + '\n'
+            return
+
+        yield '['
+        separator = ''
+        for batch in batches():
+            yield separator + ','.join(batch)
+            separator = ','
+        yield ']'
+
+    return Response(stream_with_context(generate()), mimetype=NDJSON if ndjson else 'application/json')
@@ -0,0 +1,71 @@
+import threading
+from datetime import date
+
+import click
+from sqlalchemy import update
+
+from cache import response_cache
+from config import app, db
+from models.movies import Movie
+
+# Movie.tag is set from release_date when a movie is created or edited, and
+# after that only ever moves from 'upcoming' to 'in theatres'. Rather than
+# recomputing every row, retag_movies() runs one UPDATE over the (tag,
+# release_date) index that touches only the upcoming movies whose release
+# date has been reached. Each process runs it on its first request of the
+# day; `flask retag-movies` does the same from a scheduler.
+
+UPCOMING = 'upcoming'
+IN_THEATRES = 'in theatres'
+
+movies = Movie.__table__
+
+def retag_movies(today=None):
+    today = today or date.today()
+    # Straight on the engine: this may run inside a GET, whose session reads
+    # from the read-only pool.
+    with db.engine.begin() as connection:
+        result = connection.execute(
+            update(movies)
+            .where(movies.c.tag == UPCOMING, movies.c.release_date <= today)
+            .values(tag=IN_THEATRES)
+        )
+    return result.rowcount
+
+def retag_all_movies(today=None):
+    today = today or date.today()
+    with db.engine.begin() as connection:
+        released = connection.execute(
+            update(movies).where(movies.c.release_date <= today, movies.c.tag.is_distinct_from(IN_THEATRES)).values(tag=IN_THEATRES)
+        ).rowcount
+        upcoming = connection.execute(
+            update(movies).where(movies.c.release_date > today, movies.c.tag.is_distinct_from(UPCOMING)).values(tag=UPCOMING)
+        ).rowcount
+    return released + upcoming
+
+class DailyRetag:
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.last_run = None
+
+    def run_if_due(self):
+        today = date.today()
+        if self.last_run == today:
+            return
+        with self.lock:
+            if self.last_run == today:
+                return
+            if retag_movies(today):
+                response_cache.invalidate('movies')
+            self.last_run = today
+
+daily_retag = DailyRetag()
+app.before_request(daily_retag.run_if_due)
+
+@app.cli.command('retag-movies')
+@click.option('--all', 'full', is_flag=True, help='Recompute every tag instead of only newly released movies.')
+def retag_movies_command(full):
+    """Move movies released since the last run from 'upcoming' to 'in theatres'."""
+    changed = retag_all_movies() if full else retag_movies()
+    click.echo(f'Retagged {changed} movies.')
@@ -0,0 +1,83 @@
+import os
+import sys
+import tempfile
+from datetime import date
+
+import pytest
+
+# The server modules import each other by bare name (from config import
+# app), so tests run with the server directory on the path, against a
+# throwaway file database (the read-only pool needs a file) and with the
+# query watcher on so tests can count statements.
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SERVER_DIR)
+DATABASE_DIR = tempfile.mkdtemp(prefix='server-tests-')
+os.environ['DATABASE_URL'] = f'sqlite:///{os.path.join(DATABASE_DIR, "test.db")}'
+os.environ['SECRET_KEY'] = 'test'
+os.environ['QUERY_WATCH'] = '1'
+os.environ.setdefault('BCRYPT_LOG_ROUNDS', '4')
+
+from app import app  # noqa: E402
+from cache import response_cache  # noqa: E402
+from config import db  # noqa: E402
+from holds import hold_sweeper  # noqa: E402
+from models.movies import Movie  # noqa: E402
+from models.theaters import Theatre  # noqa: E402
+from models.users import User  # noqa: E402
+from querywatch import query_watch  # noqa: E402
+from user_summaries import user_summaries  # noqa: E402
+
+# The background hold sweeper would outlive each test's tables; expiry is
+# tested by calling sweep_expired_holds() directly.
+app.before_request_funcs[None].remove(hold_sweeper.start)
+
+@pytest.fixture
+def client():
+    with app.app_context():
+        db.create_all()
+    # Warm-up: the once-a-day retag runs before the first request.
+    test_client = app.test_client()
+    test_client.get('/')
+    yield test_client
+    with app.app_context():
+        db.session.remove()
+        db.drop_all()
+    response_cache.entries.clear()
+    user_summaries.entries.clear()
+
+@app.teardown_request
+def remove_session(exception):
+    # Requests made inside the app_context fixture reuse that context
+    # instead of pushing their own, so end their session here the way a
+    # request's own context would.
+    db.session.remove()
+
+@pytest.fixture
+def app_context(client):
+    with app.app_context():
+        yield
+
+@pytest.fixture
+def statement_count():
+    # Statements run by the last request made on this thread.
+    return lambda: sum(count for count, _ in query_watch.local.shapes.values())
+
+@pytest.fixture
+def add_theatre(app_context):
+    # One user, movie and theatre, all with id 1.
+    def add(capacity):
+        db.session.add_all([
+            User(username='buyer', email='buyer@example.com'),
+            Movie(title='Premiere', release_date=date(2024, 1, 1)),
+            Theatre(name='Small', location='Town', capacity=capacity),
+        ])
+        db.session.commit()
+    return add
+
+@pytest.fixture
+def purchase():
+    # A /tickets body for the add_theatre() rows; keywords override fields.
+    return lambda **fields: {
+        "user_id": 1, "movie_id": 1, "theatre_id": 1, "price": 10, "purchase_date": "2024-01-01",
+        "screen": 1, "quantity": 1, "showtime": "2030-01-01 18:00", **fields,
+    }
@@ -0,0 +1,30 @@
+import threading
+
+from hashing import HashingBusy, PasswordHasher
+
+def test_bulk_import_leaves_capacity_for_logins():
+    hasher = PasswordHasher(rounds=8, workers=2, max_queue=2, bulk_workers=1)
+    password_hash = hasher.hash('secret')
+    results = []
+
+    def login():
+        try:
+            results.append(hasher.verify(password_hash, 'secret'))
+        except HashingBusy:
+            results.append('busy')
+
+    importing = threading.Thread(target=hasher.hash_many, args=(['password'] * 24,))
+    importing.start()
+    # Three rounds of as many logins as the interactive slots allow, all
+    # while the import is running.
+    for _ in range(3):
+        logins = [threading.Thread(target=login) for _ in range(4)]
+        for thread in logins:
+            thread.start()
+        for thread in logins:
+            thread.join()
+    assert importing.is_alive()
+    importing.join()
+
+    assert results == [True] * 12
+    assert hasher.stats()["rejected"] == 0
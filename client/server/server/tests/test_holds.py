@@ -0,0 +1,41 @@
+from datetime import datetime, timedelta
+
+from config import db
+from holds import sweep_expired_holds
+from models.seat_holds import SeatHold
+from models.seat_inventory import SeatInventory
+
+def place_hold(client, purchase, quantity):
+    hold = purchase(quantity=quantity)
+    del hold["purchase_date"]
+    response = client.post('/holds', json=hold)
+    assert response.status_code == 201
+    return response.get_json()["hold"]["id"]
+
+def seats_remaining():
+    # Outside a request the session reads on the write engine, whose
+    # BEGIN IMMEDIATE would keep the sweeper's transaction waiting.
+    seats = db.session.query(SeatInventory.seats_remaining).scalar()
+    db.session.rollback()
+    return seats
+
+def test_deleting_an_expired_hold_leaves_it_to_the_sweeper(client, add_theatre, purchase):
+    add_theatre(10)
+    hold_id = place_hold(client, purchase, 3)
+    db.session.get(SeatHold, hold_id).expires_at = datetime.now() - timedelta(seconds=1)
+    db.session.commit()
+
+    assert client.delete(f'/holds/{hold_id}').status_code == 404
+    assert seats_remaining() == 7
+
+    assert sweep_expired_holds() == 1
+    assert seats_remaining() == 10
+    assert client.delete(f'/holds/{hold_id}').status_code == 404
+
+def test_deleting_a_live_hold_releases_its_seats(client, add_theatre, purchase):
+    add_theatre(10)
+    hold_id = place_hold(client, purchase, 3)
+    assert seats_remaining() == 7
+
+    assert client.delete(f'/holds/{hold_id}').status_code == 200
+    assert seats_remaining() == 10
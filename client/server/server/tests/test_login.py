@@ -0,0 +1,50 @@
+import sqlite3
+
+from config import db
+from hashing import password_hasher
+from models.users import User
+
+def signup(client):
+    response = client.post('/signup', json={"username": "ada", "email": "ada@example.com", "password": "secret"})
+    assert response.status_code == 201
+
+def test_login_does_not_hold_the_write_lock_while_hashing(client, app_context, monkeypatch):
+    signup(client)
+    verify = password_hasher.verify
+    writable = []
+
+    def verify_and_try_to_write(password_hash, password):
+        # A booking's BEGIN IMMEDIATE, issued while bcrypt runs.
+        connection = sqlite3.connect(db.engine.url.database, timeout=0)
+        try:
+            connection.execute('BEGIN IMMEDIATE')
+            connection.rollback()
+            writable.append(True)
+        except sqlite3.OperationalError:
+            writable.append(False)
+        finally:
+            connection.close()
+        return verify(password_hash, password)
+
+    monkeypatch.setattr(password_hasher, 'verify', verify_and_try_to_write)
+    assert client.post('/login', json={"username": "ada", "password": "secret"}).status_code == 200
+    assert writable == [True]
+
+def test_login_still_saves_an_upgraded_hash(client, app_context, monkeypatch):
+    signup(client)
+    monkeypatch.setattr(password_hasher, 'rounds', password_hasher.rounds + 1)
+
+    assert client.post('/login', json={"username": "ada", "password": "secret"}).status_code == 200
+    stored = User.query.filter_by(username='ada').one()._password_hash
+    assert not password_hasher.needs_rehash(stored)
+    assert client.post('/login', json={"username": "ada", "password": "secret"}).status_code == 200
+    assert client.post('/login', json={"username": "ada", "password": "wrong"}).status_code == 401
+
+def test_login_without_a_password_is_refused_without_hashing(client, app_context, monkeypatch):
+    signup(client)
+    calls = []
+    monkeypatch.setattr(password_hasher, 'submit', lambda *args, **kwargs: calls.append(args))
+
+    assert client.post('/login', json={"username": "ada"}).status_code == 401
+    assert client.post('/login', json={"username": "ada", "password": ""}).status_code == 401
+    assert calls == []
@@ -0,0 +1,38 @@
+from datetime import date, datetime
+
+import pytest
+
+from config import db
+from models.movies import Movie
+from models.reviews import Review
+from models.theaters import Theatre
+from models.tickets import Ticket
+from models.users import User
+
+def add_rows(count):
+    # Every review and ticket gets its own user, movie and theatre, so lazy
+    # loading would cost a query per row.
+    for _ in range(count):
+        user = User(username=f'user{User.query.count()}', email=f'user{User.query.count()}@example.com')
+        movie = Movie(title='Movie', release_date=date(2024, 1, 1))
+        theatre = Theatre(name='Theatre', location='Town', capacity=100)
+        db.session.add_all([user, movie, theatre])
+        db.session.flush()
+        db.session.add(Review(rating=4, comment='Good', user_id=user.id, movie_id=movie.id))
+        db.session.add(Ticket(quantity=1, price=10, purchase_date=date(2024, 1, 1), showtime=datetime(2030, 1, 1, 18), screen=1, user_id=user.id, movie_id=movie.id, theatre_id=theatre.id))
+        db.session.commit()
+
+@pytest.mark.parametrize('path', ['/reviews', '/reviews/1', '/tickets', '/tickets/1'])
+def test_statement_count_does_not_grow_with_rows(client, app_context, statement_count, path):
+    add_rows(2)
+    assert client.get(path).status_code == 200
+    few = statement_count()
+    # The nested user, movie and theatre are joined into the one SELECT.
+    assert few == 1
+
+    add_rows(20)
+    response = client.get(path)
+    assert response.status_code == 200
+    if path in ('/reviews', '/tickets'):
+        assert len(response.get_json()['results']) == 22
+    assert statement_count() == few
@@ -0,0 +1,44 @@
+from datetime import date
+
+import pytest
+
+from config import db
+from models.movies import Movie
+from models.reviews import Review
+from models.users import User
+
+def add_reviews(count):
+    user = User(username='critic', email='critic@example.com')
+    movie = Movie(title='Premiere', release_date=date(2024, 1, 1))
+    db.session.add_all([user, movie])
+    db.session.flush()
+    db.session.add_all([Review(rating=4, comment=f'Review {n}', user_id=user.id, movie_id=movie.id) for n in range(count)])
+    db.session.commit()
+
+def test_cursor_walks_every_page(client, app_context):
+    add_reviews(5)
+
+    ids, cursor = [], None
+    while True:
+        page = client.get('/reviews?limit=2' + (f'&cursor={cursor}' if cursor else '')).get_json()
+        ids += [review['id'] for review in page['results']]
+        cursor = page['next']
+        if cursor is None:
+            break
+    assert ids == [1, 2, 3, 4, 5]
+
+@pytest.mark.parametrize('path', [
+    '/reviews?cursor=abc',
+    '/reviews?limit=ten',
+    '/tickets?cursor=abc',
+    '/users/1/tickets?limit=ten',
+    '/search?q=review&cursor=abc',
+    '/search?q=review&limit=ten',
+    '/analytics/movies?limit=ten',
+])
+def test_malformed_page_arguments_are_rejected(client, app_context, path):
+    add_reviews(1)
+
+    response = client.get(path)
+    assert response.status_code == 400
+    assert 'must be integers' in response.get_json()['error']
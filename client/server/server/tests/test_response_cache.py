@@ -0,0 +1,44 @@
+import threading
+import time
+from datetime import date
+
+import cache
+from app import app
+from config import db
+from models.movies import Movie
+
+def add_movie():
+    db.session.add(Movie(title='Before', release_date=date(2024, 1, 1)))
+    db.session.commit()
+
+def test_invalidation_during_a_miss_is_not_overwritten(client, app_context, monkeypatch):
+    add_movie()
+
+    # A PATCH commits and invalidates between the GET's read and its store.
+    original = Movie.query.__class__.all
+
+    def all_then_rename(query):
+        rows = original(query)
+        writer = threading.Thread(target=lambda: app.test_client().patch('/movies/1', json={"title": "After"}))
+        writer.start()
+        writer.join()
+        return rows
+
+    monkeypatch.setattr(Movie.query.__class__, 'all', all_then_rename)
+    assert client.get('/movies').get_json()[0]['title'] == 'Before'
+    monkeypatch.undo()
+
+    assert client.get('/movies').get_json()[0]['title'] == 'After'
+
+def test_entries_expire_after_the_ttl(client, app_context, monkeypatch):
+    add_movie()
+    assert client.get('/movies').get_json()[0]['title'] == 'Before'
+
+    # Written behind the cache's back, so only the TTL can pick it up.
+    Movie.query.update({"title": "After"})
+    db.session.commit()
+    assert client.get('/movies').get_json()[0]['title'] == 'Before'
+
+    now = time.monotonic()
+    monkeypatch.setattr(cache.time, 'monotonic', lambda: now + cache.response_cache.ttl + 1)
+    assert client.get('/movies').get_json()[0]['title'] == 'After'
@@ -0,0 +1,35 @@
+from datetime import date, datetime
+
+from config import db
+from models.movies import Movie
+from models.theaters import Theatre
+from models.tickets import Ticket
+from models.users import User
+
+SHOWTIME = '2030-01-01 18:00'
+
+def add_ticket():
+    user = User(username='viewer', email='viewer@example.com')
+    movie = Movie(title='Premiere', release_date=date(2024, 1, 1))
+    theatre = Theatre(name='Small', location='Town', capacity=50)
+    db.session.add_all([user, movie, theatre])
+    db.session.flush()
+    db.session.add(Ticket(
+        user_id=user.id, movie_id=movie.id, theatre_id=theatre.id, quantity=1, price=10,
+        purchase_date=date(2024, 1, 1), showtime=datetime(2030, 1, 1, 18, 0), screen=1,
+    ))
+    db.session.commit()
+
+def test_showtimes_keep_the_minute_format(client, app_context):
+    add_ticket()
+
+    theatre = client.get('/theaters/1').get_json()
+    assert theatre['ticket_showtimes'] == [SHOWTIME]
+
+    ticket = client.get('/tickets/1').get_json()
+    assert ticket['showtime'] == SHOWTIME
+    assert ticket['purchase_date'] == '2024-01-01'
+
+    user = db.session.get(User, 1).to_dict()
+    assert user['ticket_showtimes'] == [SHOWTIME]
+    assert user['ticket_purchase_dates'] == ['2024-01-01']
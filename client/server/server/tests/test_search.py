@@ -0,0 +1,25 @@
+from sqlalchemy import insert
+
+from config import db
+from models.movies import Movie
+from search import RANK_WINDOW
+
+def test_paging_covers_the_ranked_window_once(client, app_context):
+    # More matches than the window, with titles of different lengths so
+    # their bm25 ranks differ.
+    db.session.execute(insert(Movie), [
+        {"title": " ".join(["heist"] + ["caper"] * (n % 7)), "director": f"Director {n}"}
+        for n in range(RANK_WINDOW + 500)
+    ])
+    db.session.commit()
+
+    seen = []
+    cursor = 0
+    while cursor is not None:
+        page = client.get(f'/search?q=heist&type=movies&limit=200&cursor={cursor}').get_json()["movies"]
+        seen.extend(movie["id"] for movie in page["results"])
+        cursor = page["next"]
+
+    assert len(seen) == RANK_WINDOW
+    assert len(set(seen)) == RANK_WINDOW
+    assert client.get(f'/search?q=heist&cursor={RANK_WINDOW}').status_code == 400
@@ -0,0 +1,92 @@
+import threading
+
+from app import app
+from config import db
+from inventory import rebuild_seat_inventory
+from models.seat_inventory import SeatInventory
+from models.theaters import Theatre
+from models.tickets import Ticket
+
+CAPACITY = 25
+
+def open_showing(client, screen, seats=None):
+    showing = {"movie_id": 1, "theatre_id": 1, "screen": screen, "start_time": "2030-01-01 18:00"}
+    if seats is not None:
+        showing["seats"] = seats
+    assert client.post('/showings', json=showing).status_code == 201
+
+def seats_remaining(screen=1):
+    db.session.expire_all()
+    return db.session.query(SeatInventory.seats_remaining).filter_by(screen=screen).scalar()
+
+def test_concurrent_purchases_never_oversell(client, add_theatre, purchase):
+    add_theatre(CAPACITY)
+
+    statuses = []
+    lock = threading.Lock()
+    start = threading.Barrier(16)
+
+    def buyer():
+        thread_client = app.test_client()
+        start.wait()
+        for _ in range(10):
+            status = thread_client.post('/tickets', json=purchase(quantity=1)).status_code
+            with lock:
+                statuses.append(status)
+
+    threads = [threading.Thread(target=buyer) for _ in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # 160 single-seat purchases race for 25 seats: exactly the capacity
+    # sells, and everything after that is turned away.
+    assert set(statuses) <= {201, 409}
+    assert statuses.count(201) == CAPACITY
+    assert db.session.query(db.func.sum(Ticket.quantity)).scalar() == CAPACITY
+    assert db.session.query(SeatInventory.seats_remaining).scalar() == 0
+
+def test_rebuild_starts_from_showing_seats(client, add_theatre, purchase):
+    add_theatre(100)
+    open_showing(client, screen=1, seats=2)
+    open_showing(client, screen=2, seats=40)
+    assert client.post('/tickets', json=purchase(quantity=1)).status_code == 201
+
+    rebuild_seat_inventory()
+    assert seats_remaining(screen=1) == 1
+    # A showing with nothing sold keeps its counter.
+    assert seats_remaining(screen=2) == 40
+    assert client.post('/tickets', json=purchase(quantity=5)).status_code == 409
+
+def test_first_purchase_seeds_from_showing_seats(client, add_theatre, purchase):
+    add_theatre(100)
+    open_showing(client, screen=1, seats=2)
+    SeatInventory.query.delete()
+    db.session.commit()
+
+    assert client.post('/tickets', json=purchase(quantity=5)).status_code == 409
+    assert client.post('/tickets', json=purchase(quantity=2)).status_code == 201
+    assert seats_remaining() == 0
+
+def test_resize_leaves_showings_with_their_own_seats(client, add_theatre, purchase):
+    add_theatre(100)
+    open_showing(client, screen=1)
+    open_showing(client, screen=2, seats=10)
+    assert client.post('/tickets', json=purchase(quantity=4, screen=2)).status_code == 201
+
+    assert client.patch('/theaters/1', json={"capacity": 80}).status_code == 200
+    assert seats_remaining(screen=1) == 80
+    assert seats_remaining(screen=2) == 6
+    assert client.get('/movies/1/showings?date=2030-01-01').get_json()[0]["seats"] == 80
+
+def test_resize_below_sold_seats_is_rejected(client, add_theatre, purchase):
+    add_theatre(20)
+    open_showing(client, screen=1)
+    assert client.post('/tickets', json=purchase(quantity=15)).status_code == 201
+
+    assert client.patch('/theaters/1', json={"capacity": 10}).status_code == 409
+    assert seats_remaining() == 5
+    assert db.session.get(Theatre, 1).capacity == 20
+    assert client.patch('/theaters/1', json={"capacity": 15}).status_code == 200
+    assert seats_remaining() == 0
@@ -0,0 +1,24 @@
+def test_rejected_batch_does_not_bind_its_key(client, add_theatre, purchase):
+    add_theatre(1)
+    hold = purchase()
+    del hold["purchase_date"]
+    hold_id = client.post('/holds', json=hold).get_json()["hold"]["id"]
+
+    headers = {"Idempotency-Key": "batch-1"}
+    rejected = client.post('/tickets/batch', json=[purchase()], headers=headers)
+    assert rejected.status_code == 400
+    assert rejected.get_json()["results"][0]["status"] == 409
+
+    assert client.delete(f'/holds/{hold_id}').status_code == 200
+    retried = client.post('/tickets/batch', json=[purchase()], headers=headers)
+    assert retried.status_code == 201
+    assert retried.get_json()["created"] == 1
+    assert 'Idempotent-Replayed' not in retried.headers
+
+def test_item_errors_do_not_leak_exception_text(client, add_theatre, purchase):
+    add_theatre(10)
+
+    response = client.post('/tickets/batch', json=[purchase(quantity="two"), purchase(showtime="tonight")])
+    assert response.status_code == 400
+    errors = [result["error"] for result in response.get_json()["results"]]
+    assert errors == ["Validation error: Invalid ticket fields.", "Showtime must be in the format YYYY-MM-DD HH:MM"]
@@ -0,0 +1,119 @@
+import threading
+import time
+
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session
+
+from aggregates import previous_value
+from config import app, db
+from generations import cache_generations
+from models.reviews import Review
+from models.tickets import Ticket
+from models.users import User
+
+# /check_session runs on every page load. Rather than User.to_dict(), whose
+# association proxies load the user's whole ticket and review history, it
+# returns a compact summary read with two indexed COUNTs and kept in a small
+# per-process cache for USER_SUMMARY_TTL seconds. Ticket and review writes
+# drop the affected users' entries once their transaction commits, in every
+# worker when MULTIPROCESS is on (see generations.py).
+
+users = User.__table__
+tickets = Ticket.__table__
+reviews = Review.__table__
+
+STALE_USERS = 'stale_user_summaries'
+
+def generation_key(user_id):
+    return f'user:{user_id}'
+
+def load_user_summary(user_id):
+    row = db.session.execute(
+        select(
+            users.c.id,
+            users.c.username,
+            users.c.email,
+            select(func.count()).select_from(tickets).where(tickets.c.user_id == users.c.id).scalar_subquery().label('ticket_count'),
+            select(func.count()).select_from(reviews).where(reviews.c.user_id == users.c.id).scalar_subquery().label('review_count'),
+        ).where(users.c.id == user_id)
+    ).first()
+    return dict(row._mapping) if row is not None else None
+
+class UserSummaryCache:
+
+    def __init__(self, ttl, max_entries):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.entries = {}
+        self.lock = threading.Lock()
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id):
+        shared_generation = cache_generations.current(generation_key(user_id))
+        entry = self.entries.get(user_id)
+        if entry is not None and entry[0] > time.monotonic() and entry[1] == shared_generation:
+            self.count('hits')
+            return entry[2]
+
+        self.count('misses')
+        generation = self.generation
+        summary = load_user_summary(user_id)
+        if summary is not None and self.ttl > 0:
+            self.store(user_id, summary, generation, shared_generation)
+        return summary
+
+    def store(self, user_id, summary, generation, shared_generation):
+        with self.lock:
+            # An invalidation while the summary was loading may have made it
+            # stale already.
+            if generation != self.generation:
+                return
+            if len(self.entries) >= self.max_entries and user_id not in self.entries:
+                self.entries.pop(next(iter(self.entries)))
+            self.entries[user_id] = (time.monotonic() + self.ttl, shared_generation, summary)
+
+    def invalidate(self, *user_ids):
+        cache_generations.bump(*(generation_key(user_id) for user_id in user_ids))
+        with self.lock:
+            for user_id in user_ids:
+                self.entries.pop(user_id, None)
+            self.generation += 1
+
+    def count(self, counter):
+        with self.lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def stats(self):
+        return {
+            "entries": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "ttl_seconds": self.ttl,
+        }
+
+user_summaries = UserSummaryCache(
+    ttl=app.config['USER_SUMMARY_TTL'],
+    max_entries=app.config['USER_SUMMARY_MAX_ENTRIES'],
+)
+
+@event.listens_for(Session, 'after_flush')
+def collect_stale_users(session, flush_context):
+    stale = set()
+    for target in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(target, (Ticket, Review)):
+            stale.update((target.user_id, previous_value(target, 'user_id')))
+    stale.discard(None)
+    if stale:
+        session.info.setdefault(STALE_USERS, set()).update(stale)
+
+@event.listens_for(Session, 'after_commit')
+def invalidate_stale_users(session):
+    stale = session.info.pop(STALE_USERS, None)
+    if stale:
+        user_summaries.invalidate(*stale)
+
+@event.listens_for(Session, 'after_rollback')
+def discard_stale_users(session):
+    session.info.pop(STALE_USERS, None)